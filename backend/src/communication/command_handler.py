@@ -1,16 +1,19 @@
 """Command handler for Brunito flight computer."""
 import asyncio
 import logging
-from typing import Dict, Optional
-from datetime import datetime
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+_NS_PER_MS = 1_000_000
+
 class CommandHandler:
     """Handles command transmission and responses."""
     
     # Valid commands per Brunito protocol
-    VALID_COMMANDS = {
+    VALID_COMMANDS = frozenset({
         # System commands
         "PING", "RESET", "STATUS", "VERSION",
         # Flight commands
@@ -19,12 +22,13 @@ class CommandHandler:
         "START_LOG", "STOP_LOG", "CLEAR_LOG", "DOWNLOAD_LOG",
         # LoRa commands (with parameters)
         "LORA_FREQ", "LORA_POWER", "LORA_BW", "LORA_SF"
-    }
+    })
     
     def __init__(self, serial_manager):
         self.serial_manager = serial_manager
-        self.pending_commands = {}
-        self.command_history = []
+        self.pending_commands: Dict[str, Deque[asyncio.Future]] = {} # Oldest waiter first per command
+        self.command_history = deque(maxlen=100)  # Oldest entries evicted automatically
+        self.response_timeout_s = 5.0
     
     async def execute_command(self, command: str) -> Dict:
         """
@@ -34,78 +38,134 @@ class CommandHandler:
             command: Command string (e.g., "ARM", "LORA_FREQ:433000000")
             
         Returns:
-            Response dict with status and data
+            Response dict with status, message and timestamp (Unix epoch milliseconds)
         """
         # Parse command
-        parts = command.split(':')
-        cmd_name = parts[0].upper()
-        cmd_params = parts[1] if len(parts) > 1 else None
+        cmd_name, _, cmd_params = command.partition(':')
+        cmd_name = cmd_name.upper()
         
         # Validate command
         if cmd_name not in self.VALID_COMMANDS:
-            return {
+            return self.wire_response({
                 "status": "error",
                 "message": f"Unknown command: {cmd_name}",
-                "timestamp": datetime.now().isoformat()
-            }
+                "timestamp": time.time_ns()
+            })
+        
+        # Register the response future before sending so a fast ACK can't be missed
+        fut = asyncio.get_running_loop().create_future()
+        self.pending_commands.setdefault(cmd_name, deque()).append(fut)
         
         # Send command
         success = await self.serial_manager.send_command(command)
         if not success:
-            return {
+            self._discard_pending(cmd_name, fut)
+            return self.wire_response({
                 "status": "error",
                 "message": "Failed to send command",
-                "timestamp": datetime.now().isoformat()
-            }
+                "timestamp": time.time_ns()
+            })
         
-        # Wait for response (5 second timeout)
-        response = await self._wait_for_response(cmd_name, timeout=5.0)
+        # Wait for response
+        response = await self._wait_for_response(cmd_name, fut, timeout=self.response_timeout_s)
         
         # Log command
         self.command_history.append({
             "command": command,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "response": response
         })
         
-        return response
+        return self.wire_response(response)
     
-    async def _wait_for_response(self, command: str, timeout: float) -> Dict:
-        """Wait for command response with timeout."""
-        start_time = asyncio.get_event_loop().time()
+    @staticmethod
+    def wire_response(response: Dict) -> Dict:
+        """
+        Copy a response with its timestamp in milliseconds for sending to clients.
         
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
-            # Read from serial
-            packet = await self.serial_manager.read_packet()
-            
-            if packet:
-                # Check for ACK/NAK
-                if packet.startswith(f"ACK:{command}"):
-                    return {
-                        "status": "success",
-                        "message": packet,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                elif packet.startswith(f"NAK:{command}"):
-                    # Parse error reason
-                    parts = packet.split(':', 2)
-                    reason = parts[2] if len(parts) > 2 else "Unknown error"
-                    return {
-                        "status": "error",
-                        "message": reason,
-                        "timestamp": datetime.now().isoformat()
-                    }
-            
-            await asyncio.sleep(0.1)
+        Timestamps are kept in nanoseconds internally, but values that large are
+        above JavaScript's Number.MAX_SAFE_INTEGER and would be rounded by JSON.parse.
+        """
+        return {**response, "timestamp": response["timestamp"] // _NS_PER_MS}
+    
+    async def _wait_for_response(self, command: str, fut: asyncio.Future, timeout: float) -> Dict:
+        """Wait for the telemetry loop to resolve the command's response future."""
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            # Timeout
+            return {
+                "status": "timeout",
+                "message": f"No response received for {command}",
+                "timestamp": time.time_ns()
+            }
+        finally:
+            self._discard_pending(command, fut)
+    
+    def resolve(self, packet: bytes) -> bool:
+        """
+        Resolve a pending command from an ACK/NAK packet.
+        
+        Called by the telemetry loop, which is the only reader of the serial port.
+        
+        Returns:
+            True if the packet was an ACK/NAK response, False otherwise
+        """
+        if packet.startswith(b"ACK:"):
+            status = "success"
+        elif packet.startswith(b"NAK:"):
+            status = "error"
+        else:
+            return False
+        
+        # Format is ACK:<command>[...] or NAK:<command>:<reason>
+        packet = packet.decode('utf-8', errors='ignore')
+        _, _, rest = packet.partition(':')
+        command, sep, reason = rest.partition(':')
+        command = command.upper()
+        fut = self._pop_waiter(command)
+        if fut is None:
+            logger.warning(f"Received response with no pending command: {packet}")
+            return True
+        
+        if status == "success":
+            message = packet
+        else:
+            # Parse error reason
+            message = reason if sep else "Unknown error"
         
-        # Timeout
-        return {
-            "status": "timeout",
-            "message": f"No response received for {command}",
-            "timestamp": datetime.now().isoformat()
-        }
+        fut.set_result({
+            "status": status,
+            "message": message,
+            "timestamp": time.time_ns()
+        })
+        return True
+    
+    def _pop_waiter(self, command: str) -> Optional[asyncio.Future]:
+        """Take the oldest still-waiting future for a command, if any."""
+        waiters = self.pending_commands.get(command)
+        fut = None
+        while waiters:
+            candidate = waiters.popleft()
+            if not candidate.done():
+                fut = candidate
+                break
+        if waiters is not None and not waiters:
+            del self.pending_commands[command]
+        return fut
+    
+    def _discard_pending(self, command: str, fut: asyncio.Future):
+        """Drop a future that was answered, timed out or never sent."""
+        waiters = self.pending_commands.get(command)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(fut)
+        except ValueError:
+            pass # Already taken by resolve()
+        if not waiters:
+            del self.pending_commands[command]
     
     def get_command_history(self) -> list:
-        """Get command history."""
-        # Return last 100 commands
-        return self.command_history[-100:]
\ No newline at end of file
+        """Get command history (last 100 commands), timestamped in Unix epoch nanoseconds."""
+        return list(self.command_history)
@@ -1,14 +1,84 @@
 """Serial communication manager for Brunito Ground Station."""
 import asyncio
+import sys
+import threading
+import serial
 import serial_asyncio
 import serial.tools.list_ports
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Max bytes taken from the stream reader per read; roughly 40 Brunito packets
+_READ_CHUNK_SIZE = 4096
+
+# Longest partial line kept while waiting for a newline, as StreamReader.readline's
+# default limit; past it the bytes are noise (e.g. wrong baud rate) and are dropped
+_MAX_LINE_BYTES = 64 * 1024
+
+# Substrings of port descriptions that suggest a USB-serial adapter
+_PORT_KEYWORDS = ('usb', 'serial', 'uart')
+
+class _Win32SerialStream:
+    """
+    Event-driven serial stream for Windows.
+    
+    pyserial-asyncio has no IOCP support and polls the COM handle every 0.5 ms
+    on Windows. Instead, a reader thread blocks in pyserial's overlapped
+    ReadFile and feeds an asyncio.StreamReader, so the event loop is only woken
+    when bytes actually arrive. Exposes the StreamWriter subset SerialManager uses.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, ser: serial.Serial, reader: asyncio.StreamReader):
+        self._loop = loop
+        self._serial = ser
+        self._reader = reader
+        self._thread = threading.Thread(target=self._read_worker, name=f"serial-{ser.port}", daemon=True)
+        self._thread.start()
+    
+    def _read_worker(self):
+        """Block on the port and hand received bytes to the event loop."""
+        try:
+            while self._serial.is_open:
+                # Block for the first byte, then drain whatever else is already buffered
+                data = self._serial.read(max(1, self._serial.in_waiting))
+                if data:
+                    self._loop.call_soon_threadsafe(self._reader.feed_data, data)
+        except (serial.SerialException, TypeError, AttributeError) as e:
+            # pyserial raises these when the port is closed from another thread
+            if self._serial.is_open:
+                logger.error(f"Error reading from serial port: {e}")
+        finally:
+            try:
+                self._loop.call_soon_threadsafe(self._reader.feed_eof)
+            except RuntimeError:
+                pass  # Event loop already closed during shutdown
+    
+    def write(self, data: bytes):
+        self._serial.write(data)
+    
+    async def drain(self):
+        pass  # write() completes synchronously
+    
+    def close(self):
+        if self._serial.is_open:
+            self._serial.cancel_read()
+            self._serial.close()
+    
+    async def wait_closed(self):
+        await asyncio.to_thread(self._thread.join, 1.0)
+
+async def _open_win32_serial_connection(url: str, baudrate: int):
+    """Open a serial port on Windows, returning a (reader, writer) pair."""
+    loop = asyncio.get_running_loop()
+    # timeout=None makes read() block until data arrives; close() cancels it
+    ser = await asyncio.to_thread(serial.Serial, port=url, baudrate=baudrate, timeout=None)
+    reader = asyncio.StreamReader(loop=loop)
+    return reader, _Win32SerialStream(loop, ser, reader)
+
 class SerialManager:
     """Manages serial communication with Brunito Ground Station."""
     
@@ -18,6 +88,7 @@ class SerialManager:
         self.is_connected = False
         self.port = None
         self.baudrate = None
+        self._rx_buffer = bytearray() # Partial line carried between reads
 
     async def connect(self, port: str = "auto", baudrate: int = None) -> bool:
         """
@@ -41,15 +112,19 @@ class SerialManager:
                 if not port:
                     logger.error("No serial port found")
                     return False
-              # Open serial connection
-            self.reader, self.writer = await serial_asyncio.open_serial_connection(
-                url=port,
-                baudrate=baudrate,
-                timeout=settings.SERIAL_TIMEOUT
-            )
+            # Open serial connection
+            if sys.platform == "win32":
+                self.reader, self.writer = await _open_win32_serial_connection(port, baudrate)
+            else:
+                self.reader, self.writer = await serial_asyncio.open_serial_connection(
+                    url=port,
+                    baudrate=baudrate,
+                    timeout=settings.SERIAL_TIMEOUT
+                )
             
             self.port = port
             self.baudrate = baudrate
+            self._rx_buffer.clear()
             self.is_connected = True
             logger.info(f"Connected to serial port {port} at {baudrate} baud")
             return True
@@ -65,7 +140,8 @@ class SerialManager:
         
         for port in ports:
             # Look for common USB-serial descriptions
-            if any(keyword in port.description.lower() for keyword in ['usb', 'serial', 'uart']):
+            description = port.description.lower()
+            if any(keyword in description for keyword in _PORT_KEYWORDS):
                 logger.info(f"Found potential port: {port.device} - {port.description}")
                 return port.device
         
@@ -75,35 +151,56 @@ class SerialManager:
         
         return None
 
-    async def read_packet(self) -> Optional[str]:
+    async def read_packets(self) -> List[bytes]:
         """
-        Read a packet from serial port.
+        Read all complete packets currently available from the serial port.
+        
+        Blocks until at least one complete line has arrived, then returns every
+        line received so far in one call so bursts are drained without a
+        round-trip per packet. A trailing partial line is kept for the next call.
         
         Returns:
-            Packet string or None if no data
+            Packets as bytes without surrounding whitespace (empty if none)
         """
         if not self.is_connected or not self.reader:
-            return None
+            return []
             
         try:
-            # Read until newline or timeout
-            data = await asyncio.wait_for(
-                self.reader.readline(),
-                timeout=settings.SERIAL_TIMEOUT
-            )
-            if data:
-                # Decode and return
-                packet = data.decode('utf-8', errors='ignore').strip()
-                return packet
+            # Suspend until data arrives; the event loop wakes us on data
+            while True:
+                data = await self.reader.read(_READ_CHUNK_SIZE)
+                if not data:
+                    if self.reader.at_eof():
+                        # Port went away underneath us; stop the loop from spinning on EOF
+                        logger.warning("Serial port reached EOF, marking as disconnected")
+                        self.is_connected = False
+                    return []
                 
-        except asyncio.TimeoutError:
-            # No data available, this is normal
-            return None
+                # Extend in place; rebuilding an immutable buffer copies it on every chunk
+                self._rx_buffer += data
+                if b'\n' in data:
+                    break
+                if len(self._rx_buffer) > _MAX_LINE_BYTES:
+                    logger.warning(f"Discarding {len(self._rx_buffer)} bytes of serial data with no newline; check the baud rate")
+                    self._rx_buffer.clear()
+            
+            # Cut every complete line in one copy and leave the partial tail in place.
+            # Packets are queued and parsed later, so they must own their bytes rather
+            # than be views into a buffer the next read will overwrite.
+            end = self._rx_buffer.rindex(b'\n')
+            lines = bytes(memoryview(self._rx_buffer)[:end]).split(b'\n')
+            del self._rx_buffer[:end + 1]
+            # Keep bytes; the parser only decodes the fields that need it
+            return [packet for packet in (line.strip() for line in lines) if packet]
+                
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error reading from serial port: {e}")
-            return None
-        
-        return None
+            # A failed transport re-raises on every read without suspending; stop
+            # the read loop from spinning on it until the port is reopened
+            logger.error(f"Error reading from serial port, marking as disconnected: {e}")
+            self.is_connected = False
+            return []
     
     async def send_command(self, command: str) -> bool:
         """
@@ -1,74 +1,135 @@
 """WebSocket manager for broadcasting telemetry."""
-from typing import Set, Dict
+import asyncio
+from typing import Set, Dict, List, Optional
 from fastapi import WebSocket
-import json
+import orjson
 import logging
 
+from ..config import settings
+
 logger = logging.getLogger(__name__)
 
+class _ClientChannel:
+    """Outgoing frame queue and sender task for one client."""
+    
+    __slots__ = ('queue', 'task', 'dropped')
+    
+    def __init__(self, queue: asyncio.Queue, task: asyncio.Task):
+        self.queue = queue
+        self.task = task
+        self.dropped = 0 # Consecutive frames dropped because the queue was full
+
 class WebSocketManager:
     """Manages WebSocket connections and broadcasts."""
     
     def __init__(self):
         self.clients: Set[WebSocket] = set()
+        self._channels: Dict[WebSocket, _ClientChannel] = {}
+        self._closing: Set[asyncio.Task] = set() # Keeps eviction close() tasks alive until done
+        self._batch: List[Dict] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
     
     async def connect(self, websocket: WebSocket):
         """Accept new WebSocket connection."""
         await websocket.accept()
+        # Each client drains its own queue so a slow one can't hold back the rest
+        queue = asyncio.Queue(maxsize=settings.WEBSOCKET_CLIENT_QUEUE_SIZE)
+        task = asyncio.create_task(self._sender(websocket, queue))
+        self._channels[websocket] = _ClientChannel(queue, task)
         self.clients.add(websocket)
         logger.info(f"Client connected. Total clients: {len(self.clients)}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove disconnected client."""
+        channel = self._channels.pop(websocket, None)
+        if channel is None:
+            return # Already removed
+        
+        if channel.task is not asyncio.current_task():
+            channel.task.cancel()
         self.clients.discard(websocket)
         logger.info(f"Client disconnected. Total clients: {len(self.clients)}")
     
-    async def broadcast_telemetry(self, telemetry: Dict):
-        """Broadcast telemetry to all connected clients."""
+    def enqueue_telemetry(self, telemetry: Dict):
+        """
+        Queue telemetry for the next batched broadcast.
+        
+        Packets arriving within WEBSOCKET_BATCH_WINDOW_S are sent to clients as a
+        single telemetry_batch frame, or sooner once WEBSOCKET_BATCH_MAX_PACKETS
+        have accumulated.
+        """
         if not self.clients:
             return
         
-        # Create message
-        message = {
-            "type": "telemetry",
-            "data": telemetry
-        }
-        
-        # Send to all clients
-        disconnected = set()
-        for client in self.clients:
-            try:
-                await client.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to client: {e}")
-                disconnected.add(client)
-        
-        # Remove disconnected clients
-        for client in disconnected:
-            self.disconnect(client)
+        self._batch.append(telemetry)
+        if len(self._batch) >= settings.WEBSOCKET_BATCH_MAX_PACKETS:
+            # Batch is full, don't wait for the rest of the window (or open one at all)
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                settings.WEBSOCKET_BATCH_WINDOW_S, self._flush
+            )
     
-    async def send_event(self, event: Dict):
-        """Send event to all clients."""
-        message = {
-            "type": "event",
-            "data": event
-        }
+    def _flush(self):
+        """Send the pending telemetry batch."""
+        self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if not batch or not self.clients:
+            return
         
-        disconnected = set()
-        for client in self.clients:
+        # Serialize once for all clients; sent as a text frame since the frontend JSON.parses it
+        payload = orjson.dumps({
+            "type": "telemetry_batch",
+            "data": batch
+        }, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        self._publish(payload)
+    
+    def _publish(self, payload: str):
+        """Hand a pre-encoded frame to every client's queue without waiting on any send."""
+        for websocket, channel in list(self._channels.items()):
             try:
-                await client.send_json(message)
-            except Exception:
-                disconnected.add(client)
-        
-        for client in disconnected:
-            self.disconnect(client)
+                channel.queue.put_nowait(payload)
+                channel.dropped = 0
+            except asyncio.QueueFull:
+                channel.dropped += 1
+                if channel.dropped >= settings.WEBSOCKET_SLOW_CLIENT_MAX_DROPS:
+                    logger.warning(f"Client {websocket.client} fell too far behind, disconnecting")
+                    self.disconnect(websocket)
+                    close_task = asyncio.create_task(self._close_quietly(websocket))
+                    self._closing.add(close_task)
+                    close_task.add_done_callback(self._closing.discard)
+    
+    async def _sender(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued frames to one client until it disconnects."""
+        try:
+            while True:
+                payload = await queue.get()
+                await websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending to client: {e}")
+            self.disconnect(websocket)
+    
+    async def _close_quietly(self, websocket: WebSocket):
+        """Close a client connection, ignoring errors from an already broken socket."""
+        try:
+            await websocket.close()
+        except Exception:
+            pass
     
     async def close_all(self):
         """Close all WebSocket connections."""
-        for client in self.clients:
-            try:
-                await client.close()
-            except Exception:
-                pass
-        self.clients.clear()
\ No newline at end of file
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._batch.clear()
+        
+        for client in list(self.clients):
+            self.disconnect(client)
+            await self._close_quietly(client)
+        
+        # Let evicted clients finish closing too, so no close task is left pending at shutdown
+        await asyncio.gather(*self._closing, return_exceptions=True)
@@ -14,6 +14,12 @@ class Settings(BaseSettings):
     SERIAL_BAUDRATE: int = 921600
     SERIAL_TIMEOUT: float = 0.1
     
+    # WebSocket settings
+    WEBSOCKET_BATCH_WINDOW_S: float = 0.02  # Telemetry arriving within this window is sent as one frame
+    WEBSOCKET_BATCH_MAX_PACKETS: int = 16  # Send early once this many packets are waiting
+    WEBSOCKET_CLIENT_QUEUE_SIZE: int = 128  # Frames buffered per client before new ones are dropped
+    WEBSOCKET_SLOW_CLIENT_MAX_DROPS: int = 50  # Consecutive dropped frames before a client is disconnected
+    
     # Simulator settings
     USE_SIMULATOR: bool = False  # Disabled by default, can be started manually via API
     SIMULATOR_PROFILE: str = "suborbital_hop"
@@ -1,11 +1,18 @@
 """Main FastAPI application for BOOM telemetry backend."""
 import asyncio
 import logging
+import re
+import functools
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import List
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import orjson
 import uvicorn
+import serial # pyserial; the probe opens ports directly, outside SerialManager
 import serial.tools.list_ports
 
 from .config import settings
@@ -16,6 +23,7 @@ from .telemetry.protocol import BrunitoParser
 from .telemetry.validation import DataValidator
 from .telemetry.integrated_processor import IntegratedTelemetryProcessor # Updated: Using integrated processor
 from .processing.data_logger import DataLogger
+from .processing.metrics import LatencyRecorder
 from .simulator.brunito_simulator import BrunitoSimulator
 
 # Configure logging
@@ -35,54 +43,156 @@ data_logger = DataLogger()
 simulator = None
 integrated_processor = IntegratedTelemetryProcessor() # Central processor for Kalman, Events etc.
 
-async def telemetry_processing_loop():
-    """Main loop for processing telemetry from serial port or simulator."""
-    logger.info("Starting telemetry processing loop")
+# Raw packets waiting to be processed, bounded so a slow consumer can't grow memory
+telemetry_queue: asyncio.Queue = asyncio.Queue(maxsize=512)
+packets_dropped = 0
+parse_failures = 0 # Packets that reached the parser but were rejected
+TELEMETRY_BATCH_SIZE = 32 # Max packets processed per event loop turn
+
+# Event loop health, exported at /metrics/loop_lag
+LOOP_LAG_SAMPLE_INTERVAL_S = 0.01
+loop_lag = LatencyRecorder() # How late sleeps wake up, i.e. time the loop was blocked
+processing_batch_time = LatencyRecorder() # Time spent processing one telemetry batch
+
+# Words that suggest a port is streaming Brunito telemetry, matched in a single
+# pass per line; the lookahead lets overlapping keywords all be reported
+SERIAL_TEST_KEYWORDS = ('IDLE', 'ARMED', 'TEST', 'RECOVERY', 'FLIGHT', 'BOOST', 'COAST', 'DROGUE', 'MAIN', '<', '>')
+_SERIAL_TEST_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, SERIAL_TEST_KEYWORDS)) + '))')
+SERIAL_PROBE_CONCURRENCY = 8 # Ports probed at once by /serial/test_all
+
+# Last /serial/ports scan as (monotonic time, ports)
+SERIAL_PORTS_CACHE_TTL_S = 1.0
+_ports_cache: tuple = (float('-inf'), [])
+
+# Last encoded /stats body as (monotonic time, JSON bytes), shared by all pollers
+STATS_CACHE_TTL_S = 0.25
+_stats_cache: tuple = (float('-inf'), b"")
+
+# Recent probes that found telemetry, by port as (monotonic time, result), so UI refreshes
+# don't reopen and reconfigure the same device every time
+SERIAL_PROBE_CACHE_TTL_S = 5.0
+_probe_cache: dict = {}
+
+# Serializes simulator/serial start, reset and open so concurrent clicks can't interleave
+# processor resets and log session rotation
+_lifecycle_lock = asyncio.Lock()
+
+async def telemetry_read_loop():
+    """Read packets from serial port or simulator and queue them for processing."""
+    global packets_dropped
+    logger.info("Starting telemetry read loop")
+    loop = asyncio.get_running_loop()
+    next_sim_tick: float | None = None # Deadline of the next simulator packet
     
     while True:
         try:
-            raw_packet_data: str | None = None # To hold the string packet
-            
-            # Read packet from serial or simulator
+            # Read packets from serial or simulator
             if settings.USE_SIMULATOR:
                 if simulator:
-                    raw_packet_data = simulator.generate_packet()
-                    await asyncio.sleep(0.1)  # Simulate 10Hz data rate
+                    raw_packets = [simulator.generate_packet().encode('ascii')]
+                    # Pace against fixed deadlines so generation time doesn't stretch the 10Hz period
+                    now = loop.time()
+                    if next_sim_tick is None or now - next_sim_tick > 1.0:
+                        next_sim_tick = now # (Re)start the schedule instead of bursting to catch up
+                    next_sim_tick += simulator.dt
+                    await asyncio.sleep(max(0.0, next_sim_tick - now))
                 else:
                     # Simulator selected but not initialized, wait and continue
                     await asyncio.sleep(1)
                     continue
             else:
-                raw_packet_data = await serial_manager.read_packet()
-                if not raw_packet_data:
-                    # No data from serial, short sleep and continue
+                next_sim_tick = None
+                if not serial_manager.is_connected:
+                    # No port open yet, wait for one to be opened via the API
+                    await asyncio.sleep(0.1)
+                    continue
+                # read_packets suspends until a full line arrives, then drains everything buffered
+                raw_packets = await serial_manager.read_packets()
+                if not raw_packets:
+                    # Nothing read (error, EOF or blank lines); yield before retrying
                     await asyncio.sleep(0.01)
                     continue
             
-            # Step 1: Parse telemetry string
-            parsed_telemetry = parser.parse_telemetry(raw_packet_data)
-            if not parsed_telemetry:
-                logger.warning(f"Failed to parse packet: {raw_packet_data}")
-                continue
-            
-            # Step 2: Validate data
-            quality_flags = validator.validate_packet(parsed_telemetry)
-            parsed_telemetry['quality'] = quality_flags # Add quality flags to the telemetry dictionary
-            
-            # Step 3: Process with Integrated Telemetry Processor (Kalman Filter, Event Detection)
-            # This will add 'filtered_state', 'flight_phase', 'flight_summary', 'events', etc.
-            final_telemetry = integrated_processor.process_telemetry(parsed_telemetry)
-            
-            # Step 4: Log data
-            data_logger.log_packet(final_telemetry)
-            
-            # Step 5: Broadcast to websocket clients
-            await websocket_manager.broadcast_telemetry(final_telemetry)
+            for raw_packet_data in raw_packets:
+                # Command responses share the serial stream; hand them to the waiting command
+                # here so they never wait behind queued telemetry
+                if command_handler.resolve(raw_packet_data):
+                    continue
+                
+                try:
+                    telemetry_queue.put_nowait(raw_packet_data)
+                except asyncio.QueueFull:
+                    packets_dropped += 1
+                    if packets_dropped % 100 == 1:
+                        logger.warning(f"Telemetry queue full, dropped {packets_dropped} packets so far")
             
         except Exception as e:
-            logger.error(f"Error in telemetry loop: {e}", exc_info=True) # Log full traceback
+            logger.error(f"Error in telemetry read loop: {e}", exc_info=True) # Log full traceback
             await asyncio.sleep(0.1) # Short sleep on error before retrying
 
+def process_packet(raw_packet_data: bytes):
+    """Run one raw packet through parse, validate, filter, log and broadcast."""
+    global parse_failures
+    # Step 1: Parse telemetry string
+    parsed_telemetry = parser.parse_telemetry(raw_packet_data)
+    if not parsed_telemetry:
+        # Malformed data can arrive at line rate; only format and log one in every 100
+        parse_failures += 1
+        if parse_failures % 100 == 1:
+            logger.warning("Failed to parse packet (%d so far): %s", parse_failures, raw_packet_data)
+        return
+    
+    # Step 2: Validate data
+    quality_flags = validator.validate_packet(parsed_telemetry)
+    parsed_telemetry['quality'] = quality_flags # Add quality flags to the telemetry dictionary
+    
+    # Step 3: Process with Integrated Telemetry Processor (Kalman Filter, Event Detection)
+    # This will add 'filtered_state', 'flight_phase', 'flight_summary', 'events', etc.
+    final_telemetry = integrated_processor.process_telemetry(parsed_telemetry)
+    
+    # Step 4: Log data
+    data_logger.log_packet(final_telemetry)
+    
+    # Step 5: Queue for the next batched broadcast to websocket clients
+    websocket_manager.enqueue_telemetry(final_telemetry)
+
+async def telemetry_processing_loop():
+    """Main loop for processing queued telemetry packets in batches."""
+    logger.info("Starting telemetry processing loop")
+    
+    # Bind per-packet lookups once; these objects live for the whole process
+    queue_get = telemetry_queue.get
+    queue_get_nowait = telemetry_queue.get_nowait
+    queue_empty = telemetry_queue.empty
+    perf_counter = time.perf_counter
+    observe_batch_time = processing_batch_time.observe
+    sleep = asyncio.sleep
+    
+    while True:
+        # Wait for one packet, then take whatever else has queued up behind it
+        batch = [await queue_get()]
+        while len(batch) < TELEMETRY_BATCH_SIZE and not queue_empty():
+            batch.append(queue_get_nowait())
+        
+        started = perf_counter()
+        for raw_packet_data in batch:
+            try:
+                process_packet(raw_packet_data)
+            except Exception as e:
+                logger.error(f"Error in telemetry loop: {e}", exc_info=True) # Log full traceback
+        observe_batch_time(perf_counter() - started)
+        
+        # Let socket I/O run between batches during bursts
+        await sleep(0)
+
+async def loop_lag_monitor():
+    """Sample how late the event loop wakes from a short sleep."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(LOOP_LAG_SAMPLE_INTERVAL_S)
+        loop_lag.observe(max(0.0, loop.time() - started - LOOP_LAG_SAMPLE_INTERVAL_S))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
@@ -100,46 +210,79 @@ async def lifespan(app: FastAPI):
     # Start data logger
     data_logger.start_session()
     
-    # Start telemetry processing loop as a background task
+    # Start telemetry read and processing loops as background tasks
+    read_task = asyncio.create_task(telemetry_read_loop())
     telemetry_task = asyncio.create_task(telemetry_processing_loop())
+    lag_task = asyncio.create_task(loop_lag_monitor())
     
     yield
     
     # Shutdown
     logger.info("Shutting down BOOM telemetry backend")
+    read_task.cancel()
     telemetry_task.cancel()
-    try:
-        await telemetry_task # Wait for the task to actually cancel
-    except asyncio.CancelledError:
-        logger.info("Telemetry processing loop cancelled.")
+    lag_task.cancel()
+    for task in (read_task, telemetry_task, lag_task):
+        try:
+            await task # Wait for the task to actually cancel
+        except asyncio.CancelledError:
+            pass
+    logger.info("Telemetry loops cancelled.")
     
     # Close connections
     await serial_manager.close()
-    data_logger.stop_session()
+    # Joins the writer threads and waits on their final fsync; keep that off the event loop
+    await asyncio.to_thread(data_logger.stop_session)
     await websocket_manager.close_all()
 
+class OrjsonResponse(JSONResponse):
+    """JSON response encoded with orjson, which also handles numpy values natively."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
 # Create FastAPI app
 app = FastAPI(
     title="BOOM Telemetry Backend",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
+    # A set so the per-request origin check is a hash lookup rather than a list scan
+    allow_origins=frozenset({
         "http://localhost:1420", # Tauri dev
         "http://127.0.0.1:1420",
         "http://localhost:5173", # Vite dev (if different port)
         "http://127.0.0.1:5173",
         "tauri://localhost"      # Tauri production
-    ],
+    }),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+def api_errors(action: str, **error_fields):
+    """Return the standard error response when an endpoint raises unexpectedly.
+    
+    HTTPExceptions pass through so FastAPI still answers with their status code.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"{action}: {e}", exc_info=True)
+                return {"status": "error", "message": f"{action}: {str(e)}", **error_fields}
+        return wrapper
+    return decorator
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -148,13 +291,34 @@ async def root():
         "serial_connected": serial_manager.is_connected,
         "serial_port": serial_manager.port if serial_manager.is_connected else None,
         "websocket_clients": len(websocket_manager.clients),
-        "parser_stats": {
-             "packets_received": parser.packet_count,
-             "packets_errors": parser.error_count
-        },
+        "parser_stats": parser.snapshot(),
         "simulator_active": settings.USE_SIMULATOR and simulator is not None
     }
 
+async def _handle_ws_command(message: dict) -> dict:
+    """Execute a command sent over the WebSocket and build the reply."""
+    command_str = message.get("command")
+    response_payload = await command_handler.execute_command(command_str)
+    
+    # If ARM/DISARM command was successful, inform the integrated_processor
+    if command_str == "ARM" and response_payload.get("status") == "success":
+        integrated_processor.arm_system()
+        logger.info("System ARMED via command.")
+    elif command_str == "DISARM" and response_payload.get("status") == "success":
+        integrated_processor.disarm_system()
+        logger.info("System DISARMED via command.")
+    
+    return {
+        "type": "command_response",
+        "id": message.get("id"), # Echo back command ID
+        "response": response_payload
+    }
+
+# Client message handlers keyed by the message "type" field
+_WS_HANDLERS = {
+    "command": _handle_ws_command,
+}
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for telemetry streaming and commands."""
@@ -162,26 +326,10 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             # Receive commands from client
-            data = await websocket.receive_json()
-            if data.get("type") == "command":
-                command_str = data.get("command")
-                command_id = data.get("id") # For tracking responses if needed
-                
-                response_payload = await command_handler.execute_command(command_str)
-                
-                # If ARM/DISARM command was successful, inform the integrated_processor
-                if command_str == "ARM" and response_payload.get("status") == "success":
-                    integrated_processor.arm_system()
-                    logger.info("System ARMED via command.")
-                elif command_str == "DISARM" and response_payload.get("status") == "success":
-                    integrated_processor.disarm_system()
-                    logger.info("System DISARMED via command.")
-
-                await websocket.send_json({
-                    "type": "command_response",
-                    "id": command_id, # Echo back command ID
-                    "response": response_payload
-                })
+            message = orjson.loads(await websocket.receive_text())
+            handler = _WS_HANDLERS.get(message.get("type"))
+            if handler:
+                await websocket.send_text(orjson.dumps(await handler(message)).decode())
     except WebSocketDisconnect:
         logger.info(f"WebSocket client disconnected: {websocket.client}")
         websocket_manager.disconnect(websocket)
@@ -201,22 +349,60 @@ async def send_command_http(command: str): # Renamed to avoid conflict if used e
         integrated_processor.disarm_system()
     return {"command": command, "response": response}
 
+@app.get("/command/history")
+async def get_command_history_api():
+    """Get recent commands with human-readable timestamps."""
+    return {
+        "history": [
+            {
+                **entry,
+                "timestamp": datetime.fromtimestamp(entry["timestamp"] / 1e9, tz=timezone.utc).isoformat(),
+                "response": CommandHandler.wire_response(entry["response"])
+            }
+            for entry in command_handler.get_command_history()
+        ]
+    }
+
 @app.get("/stats")
 async def get_stats():
     """Get system statistics."""
+    global _stats_cache
+    # Dashboards poll this; rebuild and encode at most once per TTL however many are open
+    cached_at, body = _stats_cache
+    now = time.monotonic()
+    if now - cached_at >= STATS_CACHE_TTL_S:
+        body = orjson.dumps(_build_stats(), option=orjson.OPT_SERIALIZE_NUMPY)
+        _stats_cache = (now, body)
+    return Response(content=body, media_type="application/json")
+
+def _build_stats() -> dict:
+    """Collect statistics from every pipeline stage."""
+    parser_stats = parser.snapshot()
+    received = parser_stats["packets_received"]
+    total_packets = received + parser_stats["packets_errors"]
+    parser_stats["success_rate"] = received / total_packets if total_packets else 0.0
+    parser_stats["parse_failures"] = parse_failures
     return {
-        "parser": {
-            "packets_received": parser.packet_count,
-            "packets_errors": parser.error_count,
-            "success_rate": parser.packet_count / (parser.packet_count + parser.error_count) if (parser.packet_count + parser.error_count) > 0 else 0
-        },
-        "validator": validator.validation_stats, # Assuming validator keeps its own stats
+        "parser": parser_stats,
+        "validator": validator.snapshot(),
         "flight_summary": integrated_processor.get_flight_summary(), # Get summary from integrated processor
         "logger": {
             "session_id": data_logger.session_id,
             "packets_logged": data_logger.packets_logged
         },
-        "integrated_processor_packets": integrated_processor.packet_count
+        "integrated_processor_packets": integrated_processor.packet_count,
+        "telemetry_queue": {
+            "depth": telemetry_queue.qsize(),
+            "packets_dropped": packets_dropped
+        }
+    }
+
+@app.get("/metrics/loop_lag")
+async def get_loop_lag_metrics():
+    """Get event loop lag and telemetry batch processing time percentiles."""
+    return {
+        "loop_lag": loop_lag.snapshot(),
+        "processing_batch": processing_batch_time.snapshot()
     }
 
 @app.get("/simulator/status")
@@ -243,13 +429,22 @@ async def start_simulator(profile: str = "suborbital_hop"):
     global simulator # Ensure we're modifying the global simulator instance
     
     try:
-        # Initialize simulator with the specified profile
-        # This will also reset it if it was already running
-        simulator = BrunitoSimulator(profile)
-        settings.USE_SIMULATOR = True # Tell the main loop to use the simulator
-        # Reset integrated processor states for a new simulated flight
-        integrated_processor.reset_processors()
-        data_logger.start_session() # Start a new log session for the simulation
+        async with _lifecycle_lock:
+            if settings.USE_SIMULATOR and simulator and simulator.profile == profile:
+                # Already running this profile; use /simulator/reset to restart the flight
+                return {
+                    "status": "success",
+                    "message": f"Simulator already running with profile: {profile}",
+                    "profile": profile
+                }
+            
+            # Initialize simulator with the specified profile
+            # This will also replace a simulator running another profile
+            simulator = BrunitoSimulator(profile)
+            settings.USE_SIMULATOR = True # Tell the main loop to use the simulator
+            # Reset integrated processor states for a new simulated flight
+            integrated_processor.reset_processors()
+            data_logger.start_session() # Start a new log session for the simulation
         
         logger.info(f"Simulator started/restarted with profile: {profile}. USE_SIMULATOR is True.")
         
@@ -269,29 +464,24 @@ async def start_simulator(profile: str = "suborbital_hop"):
         }
 
 @app.post("/simulator/stop")
+@api_errors("Failed to stop simulator")
 async def stop_simulator():
     """Stop the simulator."""
     global simulator # Ensure we're modifying the global simulator instance
     
-    try:
-        settings.USE_SIMULATOR = False # Tell the main loop to stop using the simulator
-        # simulator = None # Optionally, destroy the simulator instance or just let it be idle
-        logger.info("Simulator stopped. USE_SIMULATOR is False.")
-        if simulator:
-            logger.info(f"Simulator instance still exists with profile {simulator.profile}, but is not being used by main loop.")
-        
-        return {
-            "status": "success",
-            "message": "Simulator stopped. Telemetry loop will attempt serial if connected."
-        }
-    except Exception as e:
-        logger.error(f"Failed to stop simulator: {e}", exc_info=True)
-        return {
-            "status": "error",
-            "message": f"Failed to stop simulator: {str(e)}"
-        }
+    settings.USE_SIMULATOR = False # Tell the main loop to stop using the simulator
+    # simulator = None # Optionally, destroy the simulator instance or just let it be idle
+    logger.info("Simulator stopped. USE_SIMULATOR is False.")
+    if simulator:
+        logger.info(f"Simulator instance still exists with profile {simulator.profile}, but is not being used by main loop.")
+    
+    return {
+        "status": "success",
+        "message": "Simulator stopped. Telemetry loop will attempt serial if connected."
+    }
 
 @app.post("/simulator/reset")
+@api_errors("Failed to reset simulator")
 async def reset_simulator_state(): # Renamed to avoid confusion with starting a new profile
     """Reset the currently active simulator to its initial state for the current profile."""
     global simulator
@@ -302,29 +492,28 @@ async def reset_simulator_state(): # Renamed to avoid confusion with starting a
             "message": "Simulator not active or not initialized."
         }
     
-    try:
+    async with _lifecycle_lock:
         simulator.reset()
         integrated_processor.reset_processors() # Also reset Kalman/Event states
         data_logger.start_session() # Start a new log for the reset simulation
-        logger.info(f"Active simulator (profile: {simulator.profile}) has been reset.")
-        
-        return {
-            "status": "success",
-            "message": f"Simulator (profile: {simulator.profile}) reset to initial state."
-        }
-    except Exception as e:
-        logger.error(f"Failed to reset simulator: {e}", exc_info=True)
-        return {
-            "status": "error",
-            "message": f"Failed to reset simulator: {str(e)}"
-        }
+    logger.info(f"Active simulator (profile: {simulator.profile}) has been reset.")
+    
+    return {
+        "status": "success",
+        "message": f"Simulator (profile: {simulator.profile}) reset to initial state."
+    }
 
 # Serial port management endpoints
 @app.get("/serial/ports")
+@api_errors("Failed to list serial ports", ports=[])
 async def list_serial_ports_api(): # Renamed to avoid conflict
     """List available serial ports."""
-    try:
-        ports_list = serial.tools.list_ports.comports()
+    global _ports_cache
+    # The UI polls this endpoint; reuse a recent scan instead of walking the USB bus again
+    cached_at, available_ports = _ports_cache
+    now = time.monotonic()
+    if now - cached_at >= SERIAL_PORTS_CACHE_TTL_S:
+        ports_list = await asyncio.to_thread(serial.tools.list_ports.comports)
         available_ports = []
         for port_info in ports_list:
             available_ports.append({
@@ -332,29 +521,18 @@ async def list_serial_ports_api(): # Renamed to avoid conflict
                 "description": port_info.description,
                 "hwid": port_info.hwid
             })
-        return {
-            "status": "success",
-            "ports": available_ports
-        }
-    except Exception as e:
-        logger.error(f"Failed to list serial ports: {e}", exc_info=True)
-        return {
-            "status": "error",
-            "message": f"Failed to list serial ports: {str(e)}",
-            "ports": []
-        }
+        _ports_cache = (now, available_ports)
+    return {
+        "status": "success",
+        "ports": available_ports
+    }
 
-@app.post("/serial/test")
-async def test_serial_port_api(port_data: dict): # Expecting JSON body with "port"
-    """Test a serial port for valid telemetry data."""
-    port = port_data.get("port")
-    if not port:
-        raise HTTPException(status_code=400, detail="Missing 'port' in request body")
+def _probe_port(port: str) -> dict:
+    """Read a few lines from a serial port and report whether it looks like telemetry.
+    
+    Blocking; run it in a worker thread so the event loop keeps serving.
+    """
     try:
-        # This is a blocking test, consider async version if it causes issues
-        import serial as pyserial_lib # Use a different alias to avoid conflict with serial_asyncio
-        import time
-        
         # Ensure the main SerialManager is not using this port
         if serial_manager.is_connected and serial_manager.port == port:
              return {
@@ -365,21 +543,22 @@ async def test_serial_port_api(port_data: dict): # Expecting JSON body with "por
 
         ser = None
         try:
-            ser = pyserial_lib.Serial(
+            ser = serial.Serial(
                 port=port,
                 baudrate=settings.SERIAL_BAUDRATE,
                 timeout=1.0 # Reduced timeout for quicker test
             )
             
-            sample_data = ""
+            sample_chunks = [] # Joined once at the end instead of growing a string per line
             has_valid_data = False
             keywords_found = []
+            seen_keywords = set()
             
-            start_time = time.time()
+            deadline = time.monotonic() + 2 # Read for max 2 seconds
             lines_read = 0
             
             # Try to read a few lines or for a short duration
-            while lines_read < 5 and (time.time() - start_time) < 2: # Read for max 2 seconds
+            while lines_read < 5 and time.monotonic() < deadline:
                 line_bytes = ser.readline()
                 if not line_bytes:
                     break 
@@ -387,20 +566,20 @@ async def test_serial_port_api(port_data: dict): # Expecting JSON body with "por
                     line = line_bytes.decode('utf-8', errors='ignore').strip()
                     if line:
                         lines_read += 1
-                        sample_data += line + "\\n"
+                        sample_chunks.append(line + "\\n")
                         
-                        line_upper = line.upper()
-                        telemetry_keywords = ['IDLE', 'ARMED', 'TEST', 'RECOVERY', 'FLIGHT', 'BOOST', 'COAST', 'DROGUE', 'MAIN', '<', '>']
-                        
-                        for keyword in telemetry_keywords:
-                            if keyword in line_upper and keyword not in keywords_found:
+                        for keyword in _SERIAL_TEST_KEYWORD_RE.findall(line.upper()):
+                            has_valid_data = True # Basic check
+                            if keyword not in seen_keywords:
+                                seen_keywords.add(keyword)
                                 keywords_found.append(keyword)
-                                has_valid_data = True # Basic check
                         
                         # More specific check for Brunito format
-                        if line.startswith('<') and line.endswith('>') and len(line.split(',')) >= 7:
+                        if line.startswith('<') and line.endswith('>') and line.count(',') >= 6:
                             has_valid_data = True
-                            if "BRUNITO_FORMAT" not in keywords_found: keywords_found.append("BRUNITO_FORMAT")
+                            if "BRUNITO_FORMAT" not in seen_keywords:
+                                seen_keywords.add("BRUNITO_FORMAT")
+                                keywords_found.append("BRUNITO_FORMAT")
 
                 except UnicodeDecodeError:
                     pass # Ignore decode errors for non-UTF8 data during test
@@ -409,19 +588,60 @@ async def test_serial_port_api(port_data: dict): # Expecting JSON body with "por
                 "status": "success",
                 "hasValidData": has_valid_data,
                 "keywords": keywords_found,
-                "sampleData": sample_data[:250] # Limit sample data length
+                "sampleData": "".join(sample_chunks)[:250] # Limit sample data length
             }
         finally:
             if ser and ser.is_open:
                 ser.close()
                 
-    except pyserial_lib.SerialException as se:
+    except serial.SerialException as se:
         logger.warning(f"SerialException testing port {port}: {se}")
         return {"status": "error", "message": f"Port {port} access denied or does not exist.", "hasValidData": False, "keywords": []}
     except Exception as e:
         logger.error(f"Failed to test port {port}: {e}", exc_info=True)
         return {"status": "error", "message": f"Failed to test port {port}: {str(e)}", "hasValidData": False, "keywords": []}
 
+async def _probe_port_cached(port: str) -> dict:
+    """Probe a port in a worker thread, reusing a recent result that found telemetry."""
+    cached = _probe_cache.get(port)
+    if cached and time.monotonic() - cached[0] < SERIAL_PROBE_CACHE_TTL_S:
+        return cached[1]
+    
+    result = await asyncio.to_thread(_probe_port, port)
+    # Only cache ports that showed telemetry; a device that just got plugged in or is
+    # still booting (opens fine but sends nothing yet) should be retried right away
+    if result.get("status") == "success" and result.get("hasValidData"):
+        _probe_cache[port] = (time.monotonic(), result)
+    return result
+
+@app.post("/serial/test")
+async def test_serial_port_api(port_data: dict): # Expecting JSON body with "port"
+    """Test a serial port for valid telemetry data."""
+    port = port_data.get("port")
+    if not port:
+        raise HTTPException(status_code=400, detail="Missing 'port' in request body")
+    return await _probe_port_cached(port)
+
+@app.get("/serial/test_all")
+async def test_all_serial_ports_api():
+    """Test every available serial port concurrently."""
+    try:
+        ports_list = await asyncio.to_thread(serial.tools.list_ports.comports)
+    except Exception as e:
+        logger.error(f"Failed to list serial ports: {e}", exc_info=True)
+        return {"status": "error", "message": f"Failed to list serial ports: {str(e)}", "results": []}
+    
+    # Cap concurrent opens so a hub full of devices doesn't thrash the USB stack
+    semaphore = asyncio.Semaphore(SERIAL_PROBE_CONCURRENCY)
+    
+    async def probe(device: str) -> dict:
+        async with semaphore:
+            result = await _probe_port_cached(device)
+        return {"port": device, **result}
+    
+    results = await asyncio.gather(*(probe(port_info.device) for port_info in ports_list))
+    return {"status": "success", "results": results}
+
 
 @app.post("/serial/open")
 async def open_serial_port_api(port_data: dict): # Expecting JSON body
@@ -432,22 +652,29 @@ async def open_serial_port_api(port_data: dict): # Expecting JSON body
         raise HTTPException(status_code=400, detail="Missing 'port' in request body")
 
     try:
-        # Stop simulator if serial is being opened
-        if settings.USE_SIMULATOR:
-            await stop_simulator() 
-            logger.info("Simulator stopped due to opening serial port.")
+        async with _lifecycle_lock:
+            if (serial_manager.is_connected and not settings.USE_SIMULATOR
+                    and serial_manager.port == port and serial_manager.baudrate == baudrate):
+                # Already streaming from this port; keep the current flight state and log
+                return {"status": "success", "message": f"Already connected to serial port {port}", "port": port, "baudrate": baudrate}
+            
+            # Stop simulator if serial is being opened
+            if settings.USE_SIMULATOR:
+                await stop_simulator() 
+                logger.info("Simulator stopped due to opening serial port.")
 
-        await serial_manager.close() # Close any existing connection
-        success = await serial_manager.connect(port, baudrate)
-        
-        if success:
-            settings.USE_SIMULATOR = False # Ensure simulator mode is off
-            integrated_processor.reset_processors() # Reset states for new serial data stream
-            data_logger.start_session() # Start new log session
-            logger.info(f"Successfully connected to serial port {port} at {baudrate} baud. USE_SIMULATOR is False.")
-            return {"status": "success", "message": f"Connected to serial port {port}", "port": port, "baudrate": baudrate}
-        else:
-            raise Exception(f"SerialManager failed to connect to {port}")
+            await serial_manager.close() # Close any existing connection
+            _probe_cache.pop(port, None) # A cached probe would hide that the port is now in use
+            success = await serial_manager.connect(port, baudrate)
+            
+            if success:
+                settings.USE_SIMULATOR = False # Ensure simulator mode is off
+                integrated_processor.reset_processors() # Reset states for new serial data stream
+                data_logger.start_session() # Start new log session
+                logger.info(f"Successfully connected to serial port {port} at {baudrate} baud. USE_SIMULATOR is False.")
+                return {"status": "success", "message": f"Connected to serial port {port}", "port": port, "baudrate": baudrate}
+            else:
+                raise Exception(f"SerialManager failed to connect to {port}")
             
     except Exception as e:
         logger.error(f"Failed to open serial port {port}: {e}", exc_info=True)
@@ -457,41 +684,31 @@ async def open_serial_port_api(port_data: dict): # Expecting JSON body
         return {"status": "error", "message": f"Failed to open serial port {port}: {str(e)}"}
 
 @app.post("/serial/close")
+@api_errors("Failed to close serial port")
 async def close_serial_port_api(): # Renamed
     """Close the current serial port connection."""
-    try:
-        await serial_manager.close()
-        logger.info("Serial port closed via API.")
-        return {"status": "success", "message": "Serial port closed"}
-    except Exception as e:
-        logger.error(f"Failed to close serial port: {e}", exc_info=True)
-        return {"status": "error", "message": f"Failed to close serial port: {str(e)}"}
+    await serial_manager.close()
+    logger.info("Serial port closed via API.")
+    return {"status": "success", "message": "Serial port closed"}
 
 @app.post("/serial/write")
+@api_errors("Failed to write to serial port")
 async def write_to_serial_port_api(payload: dict): # Expecting JSON body with "data"
     """Write data to the serial port."""
     data_to_write = payload.get("data")
     if data_to_write is None:
         raise HTTPException(status_code=400, detail="Missing 'data' in request body")
-        
-    try:
-        if not serial_manager.is_connected:
-            raise HTTPException(status_code=400, detail="Serial port not connected")
-        
-        success = await serial_manager.send_command(data_to_write) # send_command adds formatting
-        
-        if success:
-            return {"status": "success", "message": f"Data written to serial port: {data_to_write}"}
-        else:
-            # serial_manager.send_command logs errors, so we can just indicate failure here
-            raise Exception("Failed to write to serial port (see backend logs for details)")
-            
-    except Exception as e:
-        logger.error(f"Failed to write to serial port: {e}", exc_info=True)
-        # Check if it's an HTTPException and re-raise, otherwise wrap
-        if isinstance(e, HTTPException):
-            raise e
-        return {"status": "error", "message": f"Failed to write to serial port: {str(e)}"}
+    
+    if not serial_manager.is_connected:
+        raise HTTPException(status_code=400, detail="Serial port not connected")
+    
+    success = await serial_manager.send_command(data_to_write) # send_command adds formatting
+    
+    if success:
+        return {"status": "success", "message": f"Data written to serial port: {data_to_write}"}
+    else:
+        # serial_manager.send_command logs errors, so we can just indicate failure here
+        raise Exception("Failed to write to serial port (see backend logs for details)")
 
 @app.get("/serial/status")
 async def get_serial_status_api(): # Renamed
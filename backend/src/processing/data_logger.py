@@ -1,15 +1,50 @@
 """Data logger for telemetry packets."""
 import os
 import csv
+import queue
+import threading
+import time
 import logging
+import operator
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+_STOP = object() # Queued by _stop_writer to end the writer thread
+_QUEUE_MAX_PACKETS = 10000 # Backlog allowed before packets are dropped instead of logged
+_WRITE_BATCH_SIZE = 256 # Max rows handed to writerows at once
+_FSYNC_INTERVAL_S = 1.0 # How often written rows are flushed and forced to disk
+_FILE_BUFFER_BYTES = 1 << 20 # Holds well over a second of rows, so only the timed flush writes
+
+# CSV columns taken from the packet itself, then the flags from its 'quality' dict
+_PACKET_FIELDS = (
+    'timestamp', 'mode', 'altitude_m',
+    'accel_x_mps2', 'accel_y_mps2', 'accel_z_mps2',
+    'gyro_x_dps', 'gyro_y_dps', 'gyro_z_dps',
+    'mag_x_ut', 'mag_y_ut', 'mag_z_ut',
+    'latitude_deg', 'longitude_deg', 'gps_satellites',
+    'temperature_c', 'accel_magnitude_g'
+)
+_QUALITY_FIELDS = ('gps_valid', 'imu_valid', 'overall_valid')
+_FIELDNAMES = _PACKET_FIELDS + _QUALITY_FIELDS
+
+_get_packet_fields = operator.itemgetter(*_PACKET_FIELDS)
+_get_quality_fields = operator.itemgetter(*_QUALITY_FIELDS)
+
+def _csv_row(telemetry: Dict) -> tuple:
+    """Pick the logged columns out of a packet, leaving any missing ones blank."""
+    try:
+        # Complete packets, the normal case: two C-level lookups, no merged dict
+        return _get_packet_fields(telemetry) + _get_quality_fields(telemetry['quality'])
+    except KeyError:
+        quality = telemetry.get('quality') or {}
+        return tuple(telemetry.get(key, '') for key in _PACKET_FIELDS) + \
+               tuple(quality.get(key, telemetry.get(key, '')) for key in _QUALITY_FIELDS)
+
 class DataLogger:
     """Logs telemetry data to CSV files."""
     
@@ -17,39 +52,62 @@ class DataLogger:
         self.session_id = None
         self.log_file = None
         self.csv_writer = None
-        self.packets_logged = 0
+        self.packets_dropped = 0
         self.log_dir = Path(settings.LOG_DIRECTORY)
         
+        # Disk writes happen on a background thread fed by this queue
+        self._log_queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._retired_writers: List[threading.Thread] = [] # Previous sessions still draining
+        # Rows written per session; each entry is only updated by its own session's writer,
+        # so a retired writer still draining never adds to the current session's count
+        self._rows_logged: Dict[str, int] = {}
+        
         # Ensure log directory exists
         self.log_dir.mkdir(exist_ok=True)
     
+    @property
+    def packets_logged(self) -> int:
+        """Rows written to disk for the current session."""
+        return self._rows_logged.get(self.session_id, 0)
+    
     def start_session(self) -> str:
         """Start a new logging session."""
-        # Generate session ID
-        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Let any previous session's writer drain and close its file in the background;
+        # this runs on the event loop, so don't wait for the backlog or the final fsync
+        self._retire_writer()
+        
+        # Generate session ID; millisecond suffix so back-to-back sessions (open/start/reset) don't share a file
+        base_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        self.session_id = base_id
         
-        # Create log file
-        filename = f"flight_{self.session_id}.csv"
-        filepath = self.log_dir / filename
+        # Create log file; a previous writer may still be draining into a file started
+        # in the same millisecond, so never reopen (and truncate) an existing one
+        filepath = self.log_dir / f"flight_{self.session_id}.csv"
+        suffix = 1
+        while filepath.exists():
+            self.session_id = f"{base_id}_{suffix}"
+            filepath = self.log_dir / f"flight_{self.session_id}.csv"
+            suffix += 1
         
         try:
-            self.log_file = open(filepath, 'w', newline='')
+            self.log_file = open(filepath, 'w', newline='', buffering=_FILE_BUFFER_BYTES)
             
             # Write header
-            fieldnames = [
-                'timestamp', 'mode', 'altitude_m',
-                'accel_x_mps2', 'accel_y_mps2', 'accel_z_mps2',
-                'gyro_x_dps', 'gyro_y_dps', 'gyro_z_dps',
-                'mag_x_ut', 'mag_y_ut', 'mag_z_ut',
-                'latitude_deg', 'longitude_deg', 'gps_satellites',
-                'temperature_c', 'accel_magnitude_g',
-                'gps_valid', 'imu_valid', 'overall_valid'
-            ]
-            
-            self.csv_writer = csv.DictWriter(self.log_file, fieldnames=fieldnames, extrasaction='ignore')
-            self.csv_writer.writeheader()
+            self.csv_writer = csv.writer(self.log_file)
+            self.csv_writer.writerow(_FIELDNAMES)
             self.log_file.flush()
             
+            self._rows_logged[self.session_id] = 0
+            self._log_queue = queue.Queue(maxsize=_QUEUE_MAX_PACKETS)
+            self._writer_thread = threading.Thread(
+                target=self._write_loop,
+                args=(self._log_queue, self.log_file, self.csv_writer, self.session_id),
+                name=f"data-logger-{self.session_id}",
+                daemon=True
+            )
+            self._writer_thread.start()
+            
             logger.info(f"Started logging session: {self.session_id}")
             return self.session_id
             
@@ -58,45 +116,105 @@ class DataLogger:
             return None
     
     def log_packet(self, telemetry: Dict):
-        """Log a telemetry packet."""
-        if not self.csv_writer:
+        """Queue a telemetry packet for the writer thread without blocking."""
+        if self._log_queue is None:
             return
         
         try:
-            # Add quality flags if present
-            if 'quality' in telemetry:
-                for key, value in telemetry['quality'].items():
-                    telemetry[key] = value
+            self._log_queue.put_nowait(telemetry)
+        except queue.Full:
+            # Disk can't keep up; never stall the telemetry loop waiting on it
+            self.packets_dropped += 1
+            if self.packets_dropped % 1000 == 1:
+                logger.warning(f"Log queue full, dropped {self.packets_dropped} packets so far")
+    
+    def _write_loop(self, log_queue: queue.Queue, log_file, csv_writer, session_id: str):
+        """Write queued packets to disk in batches, flushing and syncing about once a second."""
+        unsynced = 0
+        last_sync = time.monotonic()
+        stopping = False
+        
+        while not stopping:
+            batch = []
+            try:
+                batch.append(log_queue.get(timeout=0.2))
+                # Take whatever else is already waiting so it goes out in one write
+                while len(batch) < _WRITE_BATCH_SIZE:
+                    batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass # Nothing (more) waiting, write what we have
+            
+            if batch and batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
             
-            # Write row
-            self.csv_writer.writerow(telemetry)
-            self.packets_logged += 1
+            if batch:
+                try:
+                    # Build column lists directly; no merged copy of each packet dict
+                    rows = [_csv_row(telemetry) for telemetry in batch]
+                    csv_writer.writerows(rows)
+                    self._rows_logged[session_id] += len(rows)
+                    unsynced += len(rows)
+                except Exception as e:
+                    logger.error(f"Failed to log {len(batch)} packets: {e}")
             
-            # Flush periodically
-            if self.packets_logged % 10 == 0:
-                self.log_file.flush()
-                
+            # Rows sit in the file buffer until here; flush and sync them together so a
+            # crash or power loss on the ground station costs at most about a second of flight data
+            now = time.monotonic()
+            if unsynced and (stopping or now - last_sync >= _FSYNC_INTERVAL_S):
+                try:
+                    log_file.flush()
+                    os.fsync(log_file.fileno())
+                except Exception as e:
+                    logger.error(f"Failed to sync log file: {e}")
+                unsynced = 0
+                last_sync = now
+        
+        logged = self._rows_logged.pop(session_id, 0)
+        try:
+            log_file.close()
+            logger.info(f"Stopped logging session: {session_id}, packets logged: {logged}")
         except Exception as e:
-            logger.error(f"Failed to log packet: {e}")
+            logger.error(f"Error closing log file: {e}")
+    
+    def _retire_writer(self):
+        """Tell the current writer thread to finish its backlog and close its file, without waiting."""
+        self._retired_writers = [t for t in self._retired_writers if t.is_alive()]
+        if self._writer_thread is None:
+            return
+        
+        log_queue = self._log_queue
+        self._retired_writers.append(self._writer_thread)
+        self._log_queue = None
+        self._writer_thread = None
+        self.log_file = None
+        self.csv_writer = None
+        
+        try:
+            log_queue.put_nowait(_STOP)
+        except queue.Full:
+            # Backlog is full; a helper waits for room so the caller never blocks
+            threading.Thread(target=log_queue.put, args=(_STOP,), daemon=True).start()
+    
+    def _stop_writer(self):
+        """Stop the writer thread and wait until every session's rows are on disk."""
+        self._retire_writer()
+        for thread in self._retired_writers:
+            thread.join()
+        self._retired_writers = []
     
     def stop_session(self):
         """Stop the current logging session."""
-        if self.log_file:
-            try:
-                self.log_file.close()
-                logger.info(f"Stopped logging session: {self.session_id}, packets logged: {self.packets_logged}")
-            except Exception as e:
-                logger.error(f"Error closing log file: {e}")
+        self._stop_writer()
         
         self.session_id = None
-        self.log_file = None
-        self.csv_writer = None
-        self.packets_logged = 0
+        self.packets_dropped = 0
     
     def get_session_info(self) -> Dict:
         """Get current session information."""
         return {
             "session_id": self.session_id,
             "packets_logged": self.packets_logged,
+            "packets_dropped": self.packets_dropped,
             "log_directory": str(self.log_dir)
         }
\ No newline at end of file
@@ -14,6 +14,46 @@ class FlightPhase(Enum):
     FLIGHT = "FLIGHT"
     LANDED = "LANDED"
 
+_PHASE_BY_VALUE = {phase.value: phase for phase in FlightPhase}
+
+class RollingStats:
+    """Fixed-size sample window with a running sum and sum of squares for O(1) mean/variance."""
+    
+    __slots__ = ('_samples', 'sum', 'sum_sq')
+    
+    def __init__(self, maxlen: int):
+        self._samples = deque(maxlen=maxlen)
+        self.sum = 0.0
+        self.sum_sq = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def append(self, x: float):
+        """Add a sample, evicting the oldest once the window is full."""
+        samples = self._samples
+        if len(samples) == samples.maxlen:
+            old = samples[0]
+            self.sum -= old
+            self.sum_sq -= old * old
+        samples.append(x)
+        self.sum += x
+        self.sum_sq += x * x
+    
+    def mean(self) -> float:
+        return self.sum / len(self._samples)
+    
+    def variance(self) -> float:
+        """Population variance of the window."""
+        n = len(self._samples)
+        mean = self.sum / n
+        return max(0.0, self.sum_sq / n - mean * mean) # Clamp rounding error from the running sums
+    
+    def clear(self):
+        self._samples.clear()
+        self.sum = 0.0
+        self.sum_sq = 0.0
+
 class EventDetector:
     """Detects flight events from telemetry."""
     
@@ -27,9 +67,13 @@ class EventDetector:
         self.landing_altitude_threshold = 50  # meters
         self.landing_accel_variance = 0.1  # g
         
-        # State tracking
-        self.launch_accel_samples = deque(maxlen=5)  # 0.5s at 10Hz
-        self.altitude_history = deque(maxlen=50)  # 5s at 10Hz
+        # State tracking, all updated in O(1) per sample
+        self.launch_accel_samples = RollingStats(5)  # 0.5s at 10Hz
+        self.accel_above_count = 0  # Consecutive samples above the launch threshold
+        self.altitude_count = 0
+        self.last_altitude = 0
+        self.rising_runs = deque(maxlen=6)  # Non-decreasing steps ending at each of the last 6 samples
+        self.falling_run = 0  # Non-increasing steps ending at the latest sample
         self.max_altitude = 0
         self.launch_time = None
         self.landing_time = None
@@ -56,7 +100,11 @@ class EventDetector:
         
         # Update histories
         self.launch_accel_samples.append(accel_g)
-        self.altitude_history.append(altitude)
+        if accel_g > self.launch_accel_threshold:
+            self.accel_above_count += 1
+        else:
+            self.accel_above_count = 0
+        self._update_altitude_trend(altitude)
         
         # Track max altitude
         if altitude > self.max_altitude:
@@ -69,7 +117,7 @@ class EventDetector:
                 self.launch_time = datetime.now()
                 event = {
                     "type": "LAUNCH_DETECTED",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": self.launch_time.isoformat(),
                     "data": {
                         "acceleration_g": accel_g,
                         "altitude_m": altitude
@@ -81,13 +129,15 @@ class EventDetector:
         
         # Detect apogee
         elif self.current_phase == FlightPhase.FLIGHT:
+            now = None # Read the clock at most once per tick, and only when an event fires
             if self._detect_apogee():
+                now = datetime.now()
                 event = {
                     "type": "APOGEE_DETECTED",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now.isoformat(),
                     "data": {
                         "max_altitude_m": self.max_altitude,
-                        "time_to_apogee_s": (datetime.now() - self.launch_time).total_seconds() if self.launch_time else 0
+                        "time_to_apogee_s": (now - self.launch_time).total_seconds() if self.launch_time else 0
                     }
                 }
                 detected_events.append(event)
@@ -97,11 +147,11 @@ class EventDetector:
             # Detect landing
             if self._detect_landing():
                 self.current_phase = FlightPhase.LANDED
-                self.landing_time = datetime.now()
+                self.landing_time = now or datetime.now()
                 flight_time = (self.landing_time - self.launch_time).total_seconds() if self.launch_time else 0
                 event = {
                     "type": "LANDING_DETECTED",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": self.landing_time.isoformat(),
                     "data": {
                         "altitude_m": altitude,
                         "flight_time_s": flight_time
@@ -113,72 +163,71 @@ class EventDetector:
         
         return detected_events
     
+    def _update_altitude_trend(self, altitude: float):
+        """Extend the rising/falling run lengths with a new altitude sample."""
+        if self.altitude_count:
+            rising_run = self.rising_runs[-1] + 1 if altitude >= self.last_altitude else 0
+            self.falling_run = self.falling_run + 1 if altitude <= self.last_altitude else 0
+        else:
+            rising_run = 0
+            self.falling_run = 0
+        self.rising_runs.append(rising_run)
+        self.altitude_count += 1
+        self.last_altitude = altitude
+    
     def _detect_launch(self) -> bool:
         """Detect launch based on sustained high acceleration."""
-        if len(self.launch_accel_samples) < 5:
-            return False
-        
-        # Check if all recent samples exceed threshold
-        return all(accel > self.launch_accel_threshold for accel in self.launch_accel_samples)
+        # All of the last 5 samples exceed the threshold
+        return self.accel_above_count >= 5
     
     def _detect_apogee(self) -> bool:
         """Detect apogee based on altitude trend."""
-        if len(self.altitude_history) < 10:
+        if self.altitude_count < 10:
             return False
         
-        # Simple detection: altitude decreasing after increase
-        recent_altitudes = list(self.altitude_history)[-10:]
-        mid_point = len(recent_altitudes) // 2
-        
-        # Check if first half was ascending and second half descending
-        ascending = all(recent_altitudes[i] <= recent_altitudes[i+1] 
-                       for i in range(mid_point-1))
-        descending = all(recent_altitudes[i] >= recent_altitudes[i+1] 
-                        for i in range(mid_point, len(recent_altitudes)-1))
-        
-        return ascending and descending
+        # Simple detection over the last 10 samples: the first 5 ascending and the
+        # last 5 descending, read from run lengths instead of rescanning the window
+        return self.rising_runs[0] >= 4 and self.falling_run >= 4
     
     def _detect_landing(self) -> bool:
         """Detect landing based on low altitude and low acceleration variance."""
-        if len(self.altitude_history) < 20:
+        if self.altitude_count < 20:
             return False
         
-        current_altitude = self.altitude_history[-1]
-        
         # Check if altitude is low
-        if current_altitude > self.landing_altitude_threshold:
+        if self.last_altitude > self.landing_altitude_threshold:
             return False
         
         # Check if acceleration is stable (low variance)
         if len(self.launch_accel_samples) >= 5:
-            accel_values = list(self.launch_accel_samples)
-            avg_accel = sum(accel_values) / len(accel_values)
-            variance = sum((x - avg_accel) ** 2 for x in accel_values) / len(accel_values)
-            
-            return variance < self.landing_accel_variance
+            return self.launch_accel_samples.variance() < self.landing_accel_variance
         
         return False
     
     def set_phase(self, phase: str):
         """Manually set flight phase (e.g., when ARM command received)."""
-        try:
-            new_phase = FlightPhase(phase)
-            self.current_phase = new_phase
-            self.phase_history.append({
-                "phase": new_phase.value,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Reset state when armed
-            if new_phase == FlightPhase.ARMED:
-                self.launch_accel_samples.clear()
-                self.altitude_history.clear()
-                self.max_altitude = 0
-                self.launch_time = None
-                self.landing_time = None
-                
-        except ValueError:
+        new_phase = _PHASE_BY_VALUE.get(phase)
+        if new_phase is None:
             logger.error(f"Invalid phase: {phase}")
+            return
+        
+        self.current_phase = new_phase
+        self.phase_history.append({
+            "phase": new_phase.value,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+        # Reset state when armed
+        if new_phase == FlightPhase.ARMED:
+            self.launch_accel_samples.clear()
+            self.accel_above_count = 0
+            self.altitude_count = 0
+            self.last_altitude = 0
+            self.rising_runs.clear()
+            self.falling_run = 0
+            self.max_altitude = 0
+            self.launch_time = None
+            self.landing_time = None
     
     def get_stats(self) -> Dict:
         """Get event detection statistics."""
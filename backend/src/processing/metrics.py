@@ -0,0 +1,34 @@
+"""Lightweight latency metrics for the backend's own event loop."""
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+class LatencyRecorder:
+    """Keeps the most recent latency samples and summarizes them as percentiles."""
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = deque(maxlen=max_samples) # Ring buffer of seconds
+        self.count = 0
+        self.max_s = 0.0
+
+    def observe(self, seconds: float):
+        """Record one latency sample."""
+        self._samples.append(seconds)
+        self.count += 1
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def snapshot(self) -> Dict:
+        """Summarize recent samples in milliseconds."""
+        if not self._samples:
+            return {"count": self.count, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+        p50, p95, p99 = np.percentile(np.fromiter(self._samples, dtype=float), (50, 95, 99)) * 1000
+        return {
+            "count": self.count,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": self.max_s * 1000 # Since startup, not just the recent window
+        }
@@ -1,10 +1,19 @@
 """Brunito telemetry simulator for testing."""
 import math
 import random
-from datetime import datetime, timedelta
+import time
 from typing import Optional
 from enum import Enum
 
+import numpy as np
+
+_NOISE_PER_PACKET = 9 # accel, gyro and mag axes
+_NOISE_BLOCK_PACKETS = 256 # Packets' worth of sensor noise drawn per refill
+
+# Timestamp, altitude, 3x accel, 3x gyro, 3x mag, lat, lon, satellites, temperature;
+# one %-format call is cheaper than the equivalent 16-field f-string
+_PACKET_FMT = "<%s,%.2f" + ",%d" * 13 + ">"
+
 class FlightProfile(Enum):
     """Pre-defined flight profiles."""
     SUBORBITAL_HOP = "suborbital_hop"
@@ -28,6 +37,11 @@ class BrunitoSimulator:
         self.launch_lon = -97.155556
         self.launch_alt = 3.0  # meters ASL
         
+        # Flat-earth GPS scale factors, fixed by the launch site; stored as
+        # degrees per meter so each packet multiplies instead of divides
+        self._deg_per_meter_lat = 1.0 / 111000
+        self._deg_per_meter_lon = 1.0 / (111000 * math.cos(math.radians(self.launch_lat)))
+        
         # Sensor parameters
         self.accel_noise_std = 0.05  # m/s²
         self.gyro_noise_std = 0.1    # deg/s
@@ -44,39 +58,69 @@ class BrunitoSimulator:
             self.burn_time = 1.5
             self.thrust_accel = 60.0
         
+        # Per-phase accelerations, built once instead of on every physics step
+        self._gravity_accel = (0.0, 0.0, -9.81)
+        # Thrust with slight angle: slight eastward, slight northward
+        self._boost_accel = (2.0, 1.0, self.thrust_accel - 9.81)
+        
+        # Phases as (end time, name, acceleration), in order; time only moves forward,
+        # so each step compares against the current phase's end instead of re-branching
+        self._phase_schedule = (
+            (0.5, "IDLE", self._gravity_accel),
+            (self.burn_time, "BOOST", self._boost_accel),
+            (math.inf, "COAST", self._gravity_accel)
+        )
+        self._phase_idx = 0
+        
         # State
         self.phase = "IDLE"
         self.gps_satellites = 8
+        
+        # Standard-normal sensor noise, drawn from NumPy in blocks instead of nine
+        # random.gauss calls per packet
+        self._rng = np.random.default_rng()
+        self._noise: list = []
+        self._noise_pos = 0
+        
+        # "MM/DD/YYYY,HH:MM:SS" for the last formatted whole second; at 10Hz only
+        # the microseconds change between most packets
+        self._ts_second = None
+        self._ts_prefix = ""
     
     def generate_packet(self) -> str:
         """Generate a Brunito format telemetry packet."""
         # Update physics
         self._update_physics()
           # Get current datetime with microsecond precision
-        now = datetime.now() + timedelta(seconds=self.time)
-        date_str = now.strftime("%m/%d/%Y")
-        time_str = now.strftime("%H:%M:%S.%f")
+        timestamp_str = self._format_timestamp(time.time() + self.time)
         
         # Calculate values
         altitude = self.launch_alt + self.position[2]
+        t = self.time
+        n = self._next_noise()
         
         # Accelerometer (with noise)
-        accel_x = int((self.acceleration[0] + random.gauss(0, self.accel_noise_std)) / 9.81 * 1000)
-        accel_y = int((self.acceleration[1] + random.gauss(0, self.accel_noise_std)) / 9.81 * 1000)
-        accel_z = int((self.acceleration[2] + random.gauss(0, self.accel_noise_std)) / 9.81 * 1000)
+        ax, ay, az = self.acceleration
+        accel_noise_std = self.accel_noise_std
+        accel_x = int((ax + n[0] * accel_noise_std) / 9.81 * 1000)
+        accel_y = int((ay + n[1] * accel_noise_std) / 9.81 * 1000)
+        accel_z = int((az + n[2] * accel_noise_std) / 9.81 * 1000)
         
         # Gyroscope (simulate some rotation)
-        gyro_x = int((5 * math.sin(self.time * 0.5) + random.gauss(0, self.gyro_noise_std)) * 100)
-        gyro_y = int((3 * math.cos(self.time * 0.7) + random.gauss(0, self.gyro_noise_std)) * 100)
-        gyro_z = int((10 * math.sin(self.time * 0.3) + random.gauss(0, self.gyro_noise_std)) * 100)
+        gyro_noise_std = self.gyro_noise_std
+        gyro_x = int((5 * math.sin(t * 0.5) + n[3] * gyro_noise_std) * 100)
+        gyro_y = int((3 * math.cos(t * 0.7) + n[4] * gyro_noise_std) * 100)
+        gyro_z = int((10 * math.sin(t * 0.3) + n[5] * gyro_noise_std) * 100)
         
         # Magnetometer (Earth's field)
-        mag_x = int((20 + random.gauss(0, self.mag_noise_std)) * 10)
-        mag_y = int((-30 + random.gauss(0, self.mag_noise_std)) * 10)
-        mag_z = int((40 + random.gauss(0, self.mag_noise_std)) * 10)
-        
-        # GPS
-        lat, lon = self._calculate_gps_position()
+        mag_noise_std = self.mag_noise_std
+        mag_x = int((20 + n[6] * mag_noise_std) * 10)
+        mag_y = int((-30 + n[7] * mag_noise_std) * 10)
+        mag_z = int((40 + n[8] * mag_noise_std) * 10)
+        
+        # GPS (simple flat-earth approximation)
+        lat = self.launch_lat + self.position[1] * self._deg_per_meter_lat
+        lon = self.launch_lon + self.position[0] * self._deg_per_meter_lon
         lat_int = int(lat * 10000000)
         lon_int = int(lon * 10000000)
         
@@ -93,34 +137,46 @@ class BrunitoSimulator:
         temp = int(25 - altitude / 1000 * 6.5)
         
         # Format packet
-        packet = f"<{date_str},{time_str},{altitude:.2f},{accel_x},{accel_y},{accel_z}," \
-                f"{gyro_x},{gyro_y},{gyro_z},{mag_x},{mag_y},{mag_z}," \
-                f"{lat_int},{lon_int},{satellites},{temp}>"
-        
-        return packet
+        return _PACKET_FMT % (
+            timestamp_str, altitude, accel_x, accel_y, accel_z,
+            gyro_x, gyro_y, gyro_z, mag_x, mag_y, mag_z,
+            lat_int, lon_int, satellites, temp
+        )
+    
+    def _format_timestamp(self, epoch: float) -> str:
+        """Format a Unix time as local "MM/DD/YYYY,HH:MM:SS.ffffff"."""
+        second = int(epoch)
+        if second != self._ts_second:
+            self._ts_prefix = time.strftime("%m/%d/%Y,%H:%M:%S", time.localtime(second))
+            self._ts_second = second
+        return "%s.%06d" % (self._ts_prefix, (epoch - second) * 1000000)
+    
+    def _next_noise(self) -> list:
+        """Return one packet's standard-normal noise samples, refilling the block when used up."""
+        pos = self._noise_pos
+        if pos >= len(self._noise):
+            self._noise = self._rng.standard_normal(_NOISE_PER_PACKET * _NOISE_BLOCK_PACKETS).tolist()
+            pos = 0
+        self._noise_pos = pos + _NOISE_PER_PACKET
+        return self._noise[pos:pos + _NOISE_PER_PACKET]
     
     def _update_physics(self):
         """Update physics simulation."""
         # Flight phases
-        if self.time < 0.5:
-            self.phase = "IDLE"
-            self.acceleration = [0, 0, -9.81]
-        elif self.time < self.burn_time:
-            self.phase = "BOOST"
-            # Thrust with slight angle
-            self.acceleration = [
-                2.0,  # slight eastward
-                1.0,  # slight northward
-                self.thrust_accel - 9.81
-            ]
-        else:
-            self.phase = "COAST"
-            self.acceleration = [0, 0, -9.81]
+        while self.time >= self._phase_schedule[self._phase_idx][0]:
+            self._phase_idx += 1
+        _, self.phase, self.acceleration = self._phase_schedule[self._phase_idx]
         
         # Integrate
-        for i in range(3):
-            self.velocity[i] += self.acceleration[i] * self.dt
-            self.position[i] += self.velocity[i] * self.dt
+        ax, ay, az = self.acceleration
+        vx, vy, vz = self.velocity
+        dt = self.dt
+        vx += ax * dt
+        vy += ay * dt
+        vz += az * dt
+        self.velocity = [vx, vy, vz]
+        px, py, pz = self.position
+        self.position = [px + vx * dt, py + vy * dt, pz + vz * dt]
         
         # Ground check
         if self.position[2] < 0 and self.velocity[2] < 0:
@@ -130,20 +186,10 @@ class BrunitoSimulator:
         
         self.time += self.dt
     
-    def _calculate_gps_position(self):
-        """Calculate GPS coordinates."""
-        # Simple flat-earth approximation
-        meters_per_degree_lat = 111000
-        meters_per_degree_lon = 111000 * math.cos(math.radians(self.launch_lat))
-        
-        lat = self.launch_lat + (self.position[1] / meters_per_degree_lat)
-        lon = self.launch_lon + (self.position[0] / meters_per_degree_lon)
-        
-        return lat, lon
-    
     def reset(self):
         """Reset simulator to initial state."""
         self.time = 0.0
+        self._phase_idx = 0
         self.position = [0.0, 0.0, 0.0]
         self.velocity = [0.0, 0.0, 0.0]
         self.acceleration = [0.0, 0.0, -9.81]
@@ -3,6 +3,8 @@ Enhanced Flight Event Detection System with Precise State Machine
 Includes apogee detection within ±5 second window
 """
 import logging
+import math
+from itertools import islice
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from datetime import datetime, timedelta
@@ -25,6 +27,12 @@ class FlightPhase(Enum):
     LANDING = "LANDING" # Final approach
     LANDED = "LANDED"
 
+# Built once at import so the per-packet paths use a dict lookup instead of Enum .value
+_PHASE_STR: Dict[FlightPhase, str] = {p: p.value for p in FlightPhase}
+_TRANSITION_TYPE: Dict[Tuple[FlightPhase, FlightPhase], str] = {
+    (a, b): f"{a.value}_TO_{b.value}" for a in FlightPhase for b in FlightPhase
+}
+
 @dataclass
 class FlightEvent:
     """Flight event with detailed data"""
@@ -40,55 +48,60 @@ class ApogeePredictor:
     velocity_history: deque = field(default_factory=lambda: deque(maxlen=50)) # Store vertical velocity
     altitude_history: deque = field(default_factory=lambda: deque(maxlen=50))
     time_history: deque = field(default_factory=lambda: deque(maxlen=50)) # Store mission time
+    samples_since_ascending: int = 0 # Samples pushed since the last one with v > 0.1
     
     def add_sample(self, time: float, altitude: float, vertical_velocity: float):
         """Add new sample for prediction"""
         self.time_history.append(time)
         self.altitude_history.append(altitude)
         self.velocity_history.append(vertical_velocity) # Use vertical velocity
+        if vertical_velocity > 0.1:
+            self.samples_since_ascending = 0
+        else:
+            self.samples_since_ascending += 1
     
     def predict_apogee_time(self) -> Optional[float]:
         """Predict time to apogee using linear fit to recent vertical velocity"""
         if len(self.velocity_history) < 10: # Need at least 10 samples (e.g., 1 second at 10Hz)
             return None
+        if self.samples_since_ascending >= 8: # At most 2 ascending points left in the 10-sample window
+            return None
         
-        # Use recent data points for prediction
-        recent_times = np.array(list(self.time_history)[-10:])
-        recent_velocities = np.array(list(self.velocity_history)[-10:])
+        # Use recent data points for prediction, oldest first
+        n = len(self.time_history)
+        recent = zip(islice(self.time_history, n - 10, n), islice(self.velocity_history, n - 10, n))
         
         # Only use data where velocity is positive (still ascending)
-        ascending_mask = recent_velocities > 0.1 # Small threshold to avoid noise around apogee
-        if not np.any(ascending_mask):
-            return None # Not ascending or no valid data points
+        # Small threshold to avoid noise around apogee
+        ascending = [(t, v) for t, v in recent if v > 0.1]
+        if len(ascending) < 3: # Need at least 3 points for a linear fit
+            return None
         
-        times_asc = recent_times[ascending_mask]
-        velocities_asc = recent_velocities[ascending_mask]
+        # Least-squares line v = a*t + b over time relative to the first point. Done in
+        # closed form: np.polyfit's per-call overhead dwarfs the math for 10 samples.
+        # We expect 'a' to be negative (around -g)
+        t0 = ascending[0][0]
+        count = len(ascending)
+        mean_t = sum(t - t0 for t, _ in ascending) / count
+        mean_v = sum(v for _, v in ascending) / count
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in ascending)
+        if var_t <= 0.0: # All samples at the same time, no slope to fit
+            return None
+        a = sum((t - t0 - mean_t) * (v - mean_v) for t, v in ascending) / var_t
+        b = mean_v - a * mean_t
         
-        if len(times_asc) < 3: # Need at least 3 points for a linear fit
+        if a >= -0.1:  # Not decelerating significantly, or accelerating
             return None
-            
-        try:
-            # Linear fit: v = at + b (where 'a' is deceleration, 't' is relative time)
-            # We expect 'a' to be negative (around -g)
-            coeffs = np.polyfit(times_asc - times_asc[0], velocities_asc, 1)
-            a, b = coeffs  # v_rel = a * t_rel + b
-            
-            if a >= -0.1:  # Not decelerating significantly, or accelerating
-                return None
-            
-            # Time from times_asc[0] until velocity is zero: t_to_apogee_rel = -b / a
-            t_to_apogee_rel = -b / a
-            predicted_apogee_mission_time = times_asc[0] + t_to_apogee_rel
-            
-            current_mission_time = recent_times[-1]
-            # Sanity check: apogee should be in the near future
-            if predicted_apogee_mission_time > current_mission_time and \
-               predicted_apogee_mission_time < current_mission_time + 60: # Max 60s prediction horizon
-                return float(predicted_apogee_mission_time)
-                
-        except (np.linalg.LinAlgError, ValueError) as e:
-            logger.warning(f"Apogee prediction polyfit failed: {e}")
-            pass # Polyfit might fail with insufficient/collinear data
+        
+        # Time from t0 until velocity is zero: t_to_apogee_rel = -b / a
+        t_to_apogee_rel = -b / a
+        predicted_apogee_mission_time = t0 + t_to_apogee_rel
+        
+        current_mission_time = self.time_history[-1]
+        # Sanity check: apogee should be in the near future
+        if predicted_apogee_mission_time > current_mission_time and \
+           predicted_apogee_mission_time < current_mission_time + 60: # Max 60s prediction horizon
+            return float(predicted_apogee_mission_time)
         
         return None
 
@@ -96,7 +109,18 @@ class EnhancedEventDetector:
     """Enhanced event detection with precise state machine and apogee window"""
     
     def __init__(self):
-        self.current_phase = FlightPhase.IDLE
+        # Per-phase tick handlers; IDLE and LANDED have nothing to detect
+        self._phase_handlers = {
+            FlightPhase.ARMED: self._tick_armed,
+            FlightPhase.LAUNCH: self._tick_launch,
+            FlightPhase.BOOST: self._tick_boost,
+            FlightPhase.BURNOUT: self._tick_burnout,
+            FlightPhase.COAST: self._tick_coast,
+            FlightPhase.APOGEE: self._tick_apogee,
+            FlightPhase.DESCENT: self._tick_descent,
+            FlightPhase.LANDING: self._tick_landing,
+        }
+        self._set_phase(FlightPhase.IDLE)
         self.phase_history: List[Tuple[datetime, FlightPhase]] = [(datetime.now(), FlightPhase.IDLE)]
         
         # Detection thresholds
@@ -107,21 +131,26 @@ class EnhancedEventDetector:
         self.landing_altitude_threshold_m = 20  # Altitude to consider for landing
         self.landed_max_velocity_mps = 0.5 # Max velocity when landed
         self.landed_accel_std_g = 0.1 # Max accel std dev when landed (g)
+        self.apogee_predict_every_n = 10 # Refresh the apogee fit every Nth COAST packet until near the window
+        self.apogee_predict_lead_s = 2.0 # Refresh every packet from this long before the window opens
         
         # State tracking (using deques for efficient appends/pops)
-        self.mission_time_samples = deque(maxlen=20) # For dt calculation if needed
         self.accel_g_samples = deque(maxlen=20) # Store total acceleration in g (e.g. 1s at 20Hz)
-        self.vertical_velocity_samples = deque(maxlen=50) # Store vertical velocity (e.g. 2.5s at 20Hz)
-        self.altitude_samples = deque(maxlen=100) # Store altitude (e.g. 5s at 20Hz)
+        self.last_mission_time_s: Optional[float] = None # Previous sample, for the fallback velocity estimate
+        self.last_altitude_m: Optional[float] = None
+        self.launch_accel_streak = 0 # Consecutive samples above the launch threshold
         
         self.apogee_predictor = ApogeePredictor()
         self.predicted_apogee_mission_time: Optional[float] = None
         self.apogee_window_start_time: Optional[float] = None
         self.apogee_window_end_time: Optional[float] = None
         self.apogee_event_triggered = False # To ensure apogee event is triggered only once
+        self.coast_tick = 0
         
         self.max_altitude_m = 0.0
         self.max_altitude_mission_time: Optional[float] = None
+        self.max_acceleration_g = 0.0
+        self.max_velocity_mps = 0.0
         
         self.launch_mission_time: Optional[float] = None
         self.burnout_mission_time: Optional[float] = None
@@ -131,31 +160,35 @@ class EnhancedEventDetector:
         self.current_mission_time_s = 0.0
         self.events: List[FlightEvent] = []
         
-        self.stats: Dict[str, Any] = {
-            'phase_durations': {}, 'max_acceleration_g': 0.0, 'max_velocity_mps': 0.0,
-            'max_altitude_m': 0.0, 'total_flight_time_s': 0.0
-        }
+        # Running maxima live in plain attributes above and are merged in by get_flight_summary
+        self.stats: Dict[str, Any] = {'phase_durations': {}, 'total_flight_time_s': 0.0}
+        # Serialized phase_history and events for get_flight_summary; they only change on
+        # a transition, so rebuild them then instead of on every packet
+        self._summary_history: Optional[Tuple[list, list]] = None
         self._reset_detection_state() # Initialize properly
 
     def _reset_detection_state(self):
         """Reset detection state for new flight or arming sequence."""
         logger.info("Resetting EnhancedEventDetector state.")
-        self.current_phase = FlightPhase.IDLE # Default to IDLE, arm command will move to ARMED
+        self._set_phase(FlightPhase.IDLE) # Default to IDLE, arm command will move to ARMED
         self.phase_history = [(datetime.now(), self.current_phase)]
         
-        self.mission_time_samples.clear()
         self.accel_g_samples.clear()
-        self.vertical_velocity_samples.clear()
-        self.altitude_samples.clear()
+        self.last_mission_time_s = None
+        self.last_altitude_m = None
+        self.launch_accel_streak = 0
         
         self.apogee_predictor = ApogeePredictor()
         self.predicted_apogee_mission_time = None
         self.apogee_window_start_time = None
         self.apogee_window_end_time = None
         self.apogee_event_triggered = False
+        self.coast_tick = 0
         
         self.max_altitude_m = 0.0
         self.max_altitude_mission_time = None
+        self.max_acceleration_g = 0.0
+        self.max_velocity_mps = 0.0
         
         self.launch_mission_time = None
         self.burnout_mission_time = None
@@ -164,10 +197,8 @@ class EnhancedEventDetector:
         
         self.current_mission_time_s = 0.0
         self.events = []
-        self.stats = {
-            'phase_durations': {}, 'max_acceleration_g': 0.0, 'max_velocity_mps': 0.0,
-            'max_altitude_m': 0.0, 'total_flight_time_s': 0.0
-        }
+        self.stats = {'phase_durations': {}, 'total_flight_time_s': 0.0}
+        self._summary_history = None
 
     def process_telemetry(self, telemetry: Dict[str, Any]) -> List[FlightEvent]:
         detected_events: List[FlightEvent] = []
@@ -181,124 +212,150 @@ class EnhancedEventDetector:
         if not self.phase_history: # Should not happen if constructor called _reset_detection_state
             self._reset_detection_state()
             self.phase_history = [(timestamp_dt, self.current_phase)]
+            self._summary_history = None
 
         self.current_mission_time_s = (timestamp_dt - self.phase_history[0][0]).total_seconds()
-        self.mission_time_samples.append(self.current_mission_time_s)
 
         accel_g = telemetry.get('accel_magnitude_g', 1.0) # Default to 1g if missing
         altitude_m = telemetry.get('altitude_m', 0.0)
         
         # Prefer filtered vertical velocity if available
-        vertical_velocity_mps = telemetry.get('filtered_state', {}).get('vertical_velocity', 0.0)
-        if vertical_velocity_mps == 0.0 and len(self.altitude_samples) > 1 and len(self.mission_time_samples) > 1:
+        filtered_state = telemetry.get('filtered_state')
+        vertical_velocity_mps = filtered_state.get('vertical_velocity', 0.0) if filtered_state else 0.0
+        if vertical_velocity_mps == 0.0 and len(self.accel_g_samples) > 1: # At least two earlier samples
             # Estimate if not available from filter (less accurate)
-            dt_est = self.mission_time_samples[-1] - self.mission_time_samples[-2]
+            dt_est = self.current_mission_time_s - self.last_mission_time_s
             if dt_est > 1e-3: # Avoid division by zero or tiny dt
-                vertical_velocity_mps = (altitude_m - self.altitude_samples[-1]) / dt_est
+                vertical_velocity_mps = (altitude_m - self.last_altitude_m) / dt_est
         
         self.accel_g_samples.append(accel_g)
-        self.altitude_samples.append(altitude_m)
-        self.vertical_velocity_samples.append(vertical_velocity_mps)
+        if accel_g > self.launch_accel_threshold_g:
+            self.launch_accel_streak += 1
+        else:
+            self.launch_accel_streak = 0
+        self.last_mission_time_s = self.current_mission_time_s
+        self.last_altitude_m = altitude_m
 
         if altitude_m > self.max_altitude_m:
             self.max_altitude_m = altitude_m
             self.max_altitude_mission_time = self.current_mission_time_s
         
-        self.stats['max_acceleration_g'] = max(self.stats['max_acceleration_g'], accel_g)
-        self.stats['max_velocity_mps'] = max(self.stats['max_velocity_mps'], abs(vertical_velocity_mps))
-        self.stats['max_altitude_m'] = self.max_altitude_m
+        if accel_g > self.max_acceleration_g:
+            self.max_acceleration_g = accel_g
+        speed_mps = abs(vertical_velocity_mps)
+        if speed_mps > self.max_velocity_mps:
+            self.max_velocity_mps = speed_mps
 
         # --- State Machine Logic ---
-        old_phase_for_event = self.current_phase
-
-        if self.current_phase == FlightPhase.ARMED:
-            if self._check_launch_conditions():
-                self.launch_mission_time = self.current_mission_time_s
-                detected_events.append(self._transition_to(FlightPhase.LAUNCH, timestamp_dt, {
-                    'initial_acceleration_g': float(accel_g), 'altitude_m': float(altitude_m)
-                }))
-        
-        elif self.current_phase == FlightPhase.LAUNCH:
-            # Transition to BOOST if launch conditions persist or slightly after launch_min_duration_s
-            if self.launch_mission_time and (self.current_mission_time_s - self.launch_mission_time > self.launch_min_duration_s):
-                 if accel_g > self.launch_accel_threshold_g * 0.8: # Still under significant thrust
-                    detected_events.append(self._transition_to(FlightPhase.BOOST, timestamp_dt, {
-                        'acceleration_g': float(accel_g), 'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps)
-                    }))
-                 elif self.launch_mission_time and (self.current_mission_time_s - self.launch_mission_time > 2.0) : # Fallback if stuck in LAUNCH
-                    logger.warning("Launch phase prolonged, forcing to BOOST or COAST based on accel")
-                    if accel_g < self.burnout_accel_drop_threshold_g :
-                        self.burnout_mission_time = self.current_mission_time_s
-                        detected_events.append(self._transition_to(FlightPhase.BURNOUT, timestamp_dt, {}))
-                    else:
-                        detected_events.append(self._transition_to(FlightPhase.BOOST, timestamp_dt, {}))
-
-
-        elif self.current_phase == FlightPhase.BOOST:
-            if self._check_burnout_conditions(accel_g):
-                self.burnout_mission_time = self.current_mission_time_s
-                detected_events.append(self._transition_to(FlightPhase.BURNOUT, timestamp_dt, {
-                    'final_acceleration_g': float(accel_g), 'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps),
-                    'burn_time_s': float(self.burnout_mission_time - (self.launch_mission_time or 0.0))
-                }))
-                self._start_apogee_prediction_window(vertical_velocity_mps)
-
-        elif self.current_phase == FlightPhase.BURNOUT:
-            # Short phase, then transition to COAST
-            if self.burnout_mission_time and (self.current_mission_time_s - self.burnout_mission_time > 0.2): # e.g. 0.2s in burnout
-                detected_events.append(self._transition_to(FlightPhase.COAST, timestamp_dt, {
-                     'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps)
-                }))
-
-        elif self.current_phase == FlightPhase.COAST:
-            self.apogee_predictor.add_sample(self.current_mission_time_s, altitude_m, vertical_velocity_mps)
-            apogee_event_data = self._check_apogee_conditions(vertical_velocity_mps, altitude_m, timestamp_dt)
-            if apogee_event_data:
-                detected_events.append(apogee_event_data)
-        
-        elif self.current_phase == FlightPhase.APOGEE:
-            # Transition to DESCENT once clearly descending
-            if vertical_velocity_mps < -self.apogee_velocity_threshold_mps * 2: # Needs to be decisively negative
-                detected_events.append(self._transition_to(FlightPhase.DESCENT, timestamp_dt, {
-                    'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps),
-                    'time_since_apogee_s': float(self.current_mission_time_s - (self.apogee_mission_time or self.current_mission_time_s))
-                }))
-
-        elif self.current_phase == FlightPhase.DESCENT:
-            if self._check_landing_approach_conditions(altitude_m, vertical_velocity_mps):
-                 detected_events.append(self._transition_to(FlightPhase.LANDING, timestamp_dt, {
-                    'altitude_m': float(altitude_m), 'descent_rate_mps': float(abs(vertical_velocity_mps))
-                }))
-        
-        elif self.current_phase == FlightPhase.LANDING:
-            if self._check_landed_conditions(altitude_m, vertical_velocity_mps, accel_g):
-                self.landing_mission_time = self.current_mission_time_s
-                self.stats['total_flight_time_s'] = float(self.landing_mission_time - (self.launch_mission_time or 0.0))
-                detected_events.append(self._transition_to(FlightPhase.LANDED, timestamp_dt, {
-                    'final_altitude_m': float(altitude_m), 'impact_acceleration_g': float(accel_g),
-                    'flight_time_s': self.stats['total_flight_time_s'], 'max_altitude_achieved_m': float(self.max_altitude_m)
-                }))
+        # The handler for the current phase is resolved on each transition, not per packet
+        handler = self._phase_handler
+        if handler is not None:
+            event = handler(timestamp_dt, accel_g, altitude_m, vertical_velocity_mps)
+            if event is not None:
+                detected_events.append(event)
         
         # If phase changed, the event was already added by _transition_to
         return detected_events
 
+    def _set_phase(self, phase: FlightPhase):
+        self.current_phase = phase
+        self.current_phase_value = _PHASE_STR[phase] # Read per packet; saves hashing the Enum each time
+        self._phase_handler = self._phase_handlers.get(phase)
+
+    def _tick_armed(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        if self._check_launch_conditions():
+            self.launch_mission_time = self.current_mission_time_s
+            return self._transition_to(FlightPhase.LAUNCH, timestamp_dt, {
+                'initial_acceleration_g': float(accel_g), 'altitude_m': float(altitude_m)
+            })
+        return None
+
+    def _tick_launch(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        # Transition to BOOST if launch conditions persist or slightly after launch_min_duration_s
+        if self.launch_mission_time and (self.current_mission_time_s - self.launch_mission_time > self.launch_min_duration_s):
+            if accel_g > self.launch_accel_threshold_g * 0.8: # Still under significant thrust
+                return self._transition_to(FlightPhase.BOOST, timestamp_dt, {
+                    'acceleration_g': float(accel_g), 'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps)
+                })
+            elif self.launch_mission_time and (self.current_mission_time_s - self.launch_mission_time > 2.0) : # Fallback if stuck in LAUNCH
+                logger.warning("Launch phase prolonged, forcing to BOOST or COAST based on accel")
+                if accel_g < self.burnout_accel_drop_threshold_g :
+                    self.burnout_mission_time = self.current_mission_time_s
+                    return self._transition_to(FlightPhase.BURNOUT, timestamp_dt, {})
+                return self._transition_to(FlightPhase.BOOST, timestamp_dt, {})
+        return None
+
+    def _tick_boost(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        if self._check_burnout_conditions(accel_g):
+            self.burnout_mission_time = self.current_mission_time_s
+            event = self._transition_to(FlightPhase.BURNOUT, timestamp_dt, {
+                'final_acceleration_g': float(accel_g), 'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps),
+                'burn_time_s': float(self.burnout_mission_time - (self.launch_mission_time or 0.0))
+            })
+            self._start_apogee_prediction_window(vertical_velocity_mps)
+            return event
+        return None
+
+    def _tick_burnout(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        # Short phase, then transition to COAST
+        if self.burnout_mission_time and (self.current_mission_time_s - self.burnout_mission_time > 0.2): # e.g. 0.2s in burnout
+            return self._transition_to(FlightPhase.COAST, timestamp_dt, {
+                 'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps)
+            })
+        return None
+
+    def _tick_coast(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        self.apogee_predictor.add_sample(self.current_mission_time_s, altitude_m, vertical_velocity_mps)
+        return self._check_apogee_conditions(vertical_velocity_mps, altitude_m, timestamp_dt)
+
+    def _tick_apogee(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        # Transition to DESCENT once clearly descending
+        if vertical_velocity_mps < -self.apogee_velocity_threshold_mps * 2: # Needs to be decisively negative
+            return self._transition_to(FlightPhase.DESCENT, timestamp_dt, {
+                'altitude_m': float(altitude_m), 'velocity_mps': float(vertical_velocity_mps),
+                'time_since_apogee_s': float(self.current_mission_time_s - (self.apogee_mission_time or self.current_mission_time_s))
+            })
+        return None
+
+    def _tick_descent(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        if self._check_landing_approach_conditions(altitude_m, vertical_velocity_mps):
+            return self._transition_to(FlightPhase.LANDING, timestamp_dt, {
+                'altitude_m': float(altitude_m), 'descent_rate_mps': float(abs(vertical_velocity_mps))
+            })
+        return None
+
+    def _tick_landing(self, timestamp_dt: datetime, accel_g: float, altitude_m: float, vertical_velocity_mps: float) -> Optional[FlightEvent]:
+        if self._check_landed_conditions(altitude_m, vertical_velocity_mps, accel_g):
+            self.landing_mission_time = self.current_mission_time_s
+            self.stats['total_flight_time_s'] = float(self.landing_mission_time - (self.launch_mission_time or 0.0))
+            return self._transition_to(FlightPhase.LANDED, timestamp_dt, {
+                'final_altitude_m': float(altitude_m), 'impact_acceleration_g': float(accel_g),
+                'flight_time_s': self.stats['total_flight_time_s'], 'max_altitude_achieved_m': float(self.max_altitude_m)
+            })
+        return None
+
     def _check_launch_conditions(self) -> bool:
-        if len(self.accel_g_samples) < int(self.launch_min_duration_s * 10): # Assuming 10-20Hz, need enough samples
-            return False
-        # Check if average acceleration over a short window is high and sustained
-        # Use a slice of recent samples, e.g., last 0.3 seconds
-        recent_accels = list(self.accel_g_samples)[-int(self.launch_min_duration_s * 10):]
-        if not recent_accels: return False
-        return all(a > self.launch_accel_threshold_g for a in recent_accels)
+        # Check if acceleration is high and sustained over the most recent samples,
+        # e.g., last 0.3 seconds (assuming 10-20Hz)
+        window = int(self.launch_min_duration_s * 10)
+        if window <= 0: return False
+        return self.launch_accel_streak >= window
 
     def _check_burnout_conditions(self, current_accel_g: float) -> bool:
         if len(self.accel_g_samples) < 5: # Need a few samples to detect change
             return False
+        # Must be below launch threshold too; checked first so the boost average is
+        # only computed once thrust has actually dropped
+        if current_accel_g >= self.launch_accel_threshold_g:
+            return False
         # Detect a significant drop in acceleration, indicating thrust termination
         # Compare current accel to a recent average during boost
-        avg_boost_accel = np.mean(list(self.accel_g_samples)[-10:-3]) if len(self.accel_g_samples) > 10 else self.launch_accel_threshold_g * 1.5
-        return current_accel_g < (avg_boost_accel - self.burnout_accel_drop_threshold_g) and \
-               current_accel_g < self.launch_accel_threshold_g # Must be below launch threshold too
+        if len(self.accel_g_samples) > 10:
+            n = len(self.accel_g_samples)
+            avg_boost_accel = sum(islice(self.accel_g_samples, n - 10, n - 3)) / 7
+        else:
+            avg_boost_accel = self.launch_accel_threshold_g * 1.5
+        return current_accel_g < (avg_boost_accel - self.burnout_accel_drop_threshold_g)
 
     def _start_apogee_prediction_window(self, current_vertical_velocity_mps: float):
         if current_vertical_velocity_mps > 0:
@@ -324,9 +381,14 @@ class EnhancedEventDetector:
                              abs(self.current_mission_time_s - self.max_altitude_mission_time) < 1.0 and \
                              abs(altitude_m - self.max_altitude_m) < 5.0 # Within 5m of recorded max
 
-        # Update actual prediction from ApogeePredictor
-        live_predicted_time = self.apogee_predictor.predict_apogee_time()
-        if live_predicted_time: self.predicted_apogee_mission_time = live_predicted_time
+        # Update actual prediction from ApogeePredictor. Early in coast the window is
+        # seconds away and a decimated refresh is enough; near it, refresh every packet
+        self.coast_tick += 1
+        near_window = self.apogee_window_start_time is None or \
+                      self.current_mission_time_s >= self.apogee_window_start_time - self.apogee_predict_lead_s
+        if near_window or self.coast_tick % self.apogee_predict_every_n == 0:
+            live_predicted_time = self.apogee_predictor.predict_apogee_time()
+            if live_predicted_time: self.predicted_apogee_mission_time = live_predicted_time
 
         within_prediction_window = False
         if self.apogee_window_start_time and self.apogee_window_end_time:
@@ -369,30 +431,37 @@ class EnhancedEventDetector:
                vertical_velocity_mps < -1.0 # Consistently descending
 
     def _check_landed_conditions(self, altitude_m: float, vertical_velocity_mps: float, accel_g: float) -> bool:
-        if len(self.accel_g_samples) < 10 or len(self.vertical_velocity_samples) < 10:
+        if len(self.accel_g_samples) < 10:
             return False
         
-        # Low altitude, very low vertical velocity, and stable acceleration around 1g
-        recent_accels_g = list(self.accel_g_samples)[-10:]
-        accel_std_dev_g = np.std(recent_accels_g)
-        avg_accel_g = np.mean(recent_accels_g)
+        # Low altitude and very low vertical velocity; cheap scalar checks first so the
+        # window statistics are only computed once the rocket is nearly at rest
+        if not (altitude_m < self.landing_altitude_threshold_m / 2 and
+                abs(vertical_velocity_mps) < self.landed_max_velocity_mps):
+            return False
+        
+        # Stable acceleration around 1g
+        n = len(self.accel_g_samples)
+        recent_accels_g = list(islice(self.accel_g_samples, n - 10, n))
+        avg_accel_g = sum(recent_accels_g) / 10
+        accel_std_dev_g = math.sqrt(sum((a - avg_accel_g) ** 2 for a in recent_accels_g) / 10) # Population std, as np.std
 
-        return altitude_m < self.landing_altitude_threshold_m / 2 and \
-               abs(vertical_velocity_mps) < self.landed_max_velocity_mps and \
-               accel_std_dev_g < self.landed_accel_std_g and \
+        return accel_std_dev_g < self.landed_accel_std_g and \
                abs(avg_accel_g - 1.0) < 0.2 # Acceleration close to 1g
 
     def _transition_to(self, new_phase: FlightPhase, timestamp_dt: datetime, event_data: Dict[str, Any]) -> FlightEvent:
         old_phase = self.current_phase
-        self.current_phase = new_phase
+        self._set_phase(new_phase)
         
         # Calculate duration of the old phase
         if len(self.phase_history) > 0:
             prev_timestamp_dt, _ = self.phase_history[-1]
             duration_s = (timestamp_dt - prev_timestamp_dt).total_seconds()
-            self.stats['phase_durations'][old_phase.value] = self.stats['phase_durations'].get(old_phase.value, 0.0) + duration_s
+            old_phase_str = _PHASE_STR[old_phase]
+            self.stats['phase_durations'][old_phase_str] = self.stats['phase_durations'].get(old_phase_str, 0.0) + duration_s
         
         self.phase_history.append((timestamp_dt, new_phase))
+        self._summary_history = None # New lists on next summary; ones already handed out stay as they were
         
         # Ensure all data in event_data is JSON serializable (float, bool, str, list, dict)
         serializable_event_data = {k: (float(v) if isinstance(v, (np.float32, np.float64, np.number)) else
@@ -401,7 +470,7 @@ class EnhancedEventDetector:
                                    for k, v in event_data.items()}
 
         event = FlightEvent(
-            type=f"{old_phase.value}_TO_{new_phase.value}", # Changed for clarity
+            type=_TRANSITION_TYPE[(old_phase, new_phase)], # Changed for clarity
             timestamp=timestamp_dt,
             phase_transition=(old_phase, new_phase),
             data=serializable_event_data,
@@ -421,7 +490,7 @@ class EnhancedEventDetector:
                 logger.info(f"External command to set phase: {self.current_phase.value} -> {new_phase.value}")
                 if new_phase == FlightPhase.ARMED:
                     self._reset_detection_state() # Full reset before arming
-                    self.current_phase = FlightPhase.IDLE # Ensure transition from IDLE
+                    self._set_phase(FlightPhase.IDLE) # Ensure transition from IDLE
                 
                 # Create a simplified event for external phase changes
                 event_data = {'source': 'external_command'}
@@ -432,7 +501,7 @@ class EnhancedEventDetector:
                  # If already ARMED and ARMED command received, reset state for a new sequence
                 logger.info("Re-arming system, resetting detection state.")
                 self._reset_detection_state()
-                self.current_phase = FlightPhase.IDLE # Temporarily set to IDLE to allow proper transition
+                self._set_phase(FlightPhase.IDLE) # Temporarily set to IDLE to allow proper transition
                 self._transition_to(FlightPhase.ARMED, current_time, {'source': 'external_re_arm'})
 
 
@@ -448,35 +517,37 @@ class EnhancedEventDetector:
             'detected': bool(self.apogee_event_triggered) # Ensure Python bool
         }
 
-        serializable_events = []
-        for e in self.events:
-            serializable_events.append({
-                'type': e.type,
-                'timestamp': e.timestamp.isoformat(),
-                'phase_transition': [e.phase_transition[0].value, e.phase_transition[1].value],
-                'data': {k: (float(v) if isinstance(v, (np.float32, np.float64, np.number)) else
-                             bool(v) if isinstance(v, np.bool_) else
-                             v) 
-                         for k, v in e.data.items()}, # Ensure data is serializable
-                'confidence': float(e.confidence)
-            })
+        if self._summary_history is None:
+            serializable_events = []
+            for e in self.events:
+                serializable_events.append({
+                    'type': e.type,
+                    'timestamp': e.timestamp.isoformat(),
+                    'phase_transition': [_PHASE_STR[e.phase_transition[0]], _PHASE_STR[e.phase_transition[1]]],
+                    'data': {k: (float(v) if isinstance(v, (np.float32, np.float64, np.number)) else
+                                 bool(v) if isinstance(v, np.bool_) else
+                                 v) 
+                             for k, v in e.data.items()}, # Ensure data is serializable
+                    'confidence': float(e.confidence)
+                })
+            phase_history = [(t.isoformat(), _PHASE_STR[p]) for t, p in self.phase_history]
+            self._summary_history = (phase_history, serializable_events)
+        phase_history, serializable_events = self._summary_history
         
         # Ensure all stats are Python floats
-        serializable_stats = {}
-        for k, v_obj in self.stats.items():
-            if k == 'phase_durations': # This is a dict
-                serializable_stats[k] = {phase: float(dur) for phase, dur in v_obj.items()}
-            elif isinstance(v_obj, (np.number, int, float)):
-                 serializable_stats[k] = float(v_obj)
-            else: # Should not happen if stats are numbers
-                 serializable_stats[k] = v_obj
-
+        serializable_stats = {
+            'phase_durations': {phase: float(dur) for phase, dur in self.stats['phase_durations'].items()},
+            'max_acceleration_g': float(self.max_acceleration_g),
+            'max_velocity_mps': float(self.max_velocity_mps),
+            'max_altitude_m': float(self.max_altitude_m),
+            'total_flight_time_s': float(self.stats['total_flight_time_s'])
+        }
 
         return {
-            'current_phase': self.current_phase.value,
+            'current_phase': self.current_phase_value,
             'mission_time_s': float(self.current_mission_time_s),
             'statistics': serializable_stats,
-            'phase_history': [(t.isoformat(), p.value) for t, p in self.phase_history],
+            'phase_history': phase_history,
             'events': serializable_events,
             'apogee_prediction': apogee_pred_data
         }
@@ -491,7 +562,7 @@ class EventDetectorProcessor:
         # Ensure telemetry has a valid timestamp string
         if 'timestamp' not in telemetry or not isinstance(telemetry['timestamp'], str):
             logger.error("Missing or invalid timestamp in telemetry for event detection.")
-            telemetry['flight_phase'] = self.event_detector.current_phase.value
+            telemetry['flight_phase'] = self.event_detector.current_phase_value
             telemetry['mission_time_s'] = self.event_detector.current_mission_time_s
             telemetry['flight_summary'] = self.event_detector.get_flight_summary()
             return telemetry
@@ -506,12 +577,12 @@ class EventDetectorProcessor:
                 telemetry['events'].append({
                     'type': fe.type,
                     'timestamp': fe.timestamp.isoformat(),
-                    'phase_transition': [fe.phase_transition[0].value, fe.phase_transition[1].value],
+                    'phase_transition': [_PHASE_STR[fe.phase_transition[0]], _PHASE_STR[fe.phase_transition[1]]],
                     'data': fe.data,
                     'confidence': fe.confidence
                 })
         
-        telemetry['flight_phase'] = self.event_detector.current_phase.value
+        telemetry['flight_phase'] = self.event_detector.current_phase_value
         telemetry['mission_time_s'] = self.event_detector.current_mission_time_s # Ensure this is updated
         telemetry['flight_summary'] = self.event_detector.get_flight_summary() # Get the full summary
         
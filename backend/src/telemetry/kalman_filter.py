@@ -83,6 +83,10 @@ class ExtendedKalmanFilter:
         # Earth parameters
         self.earth_radius = 6371000  # meters
         
+        # Reused by every predict/update so the hot path doesn't rebuild them per packet
+        self._I = np.eye(15)
+        self._F = np.eye(15)
+        
     def set_reference_coordinates(self, lat: float, lon: float, alt: float):
         """
         Set the reference coordinates for GPS-to-NED conversion from the first GPS packet.
@@ -106,8 +110,8 @@ class ExtendedKalmanFilter:
         vel = self.state[3:6]
         
         # State transition matrix F
-        F = np.eye(15)
-        F[0:3, 3:6] = np.eye(3) * dt  # Position depends on velocity
+        F = self._F
+        np.fill_diagonal(F[0:3, 3:6], dt)  # Position depends on velocity
         
         # Predict state
         self.state[0:3] = pos + vel * dt  # Update position
@@ -146,18 +150,16 @@ class ExtendedKalmanFilter:
 
         y = accel - expected_accel_body # Innovation
         
-        H = np.zeros((3, 15))
-        H[2, 13] = 1.0 # d(expected_accel_body_z)/d(baz) = 1
-        
-        S = H @ self.P @ H.T + self.R_accel
-        try:
-            K = self.P @ H.T @ np.linalg.inv(S)
-        except np.linalg.LinAlgError:
+        # H only has d(expected_accel_body_z)/d(baz) = 1 and R_accel is diagonal, so
+        # this reduces to a scalar update on the Z axis against column 13 of P
+        S = self.P[13, 13] + self.R_accel[2, 2]
+        if S <= 1e-9:
             logger.warning("Singular matrix S in IMU update, skipping update step.")
             return
 
-        self.state += K @ y
-        self.P = (np.eye(15) - K @ H) @ self.P
+        K = self.P[:, 13] / S
+        self.state += K * y[2]
+        self.P = self.P - np.outer(K, self.P[13, :])
         
         self.state[6:10] /= np.linalg.norm(self.state[6:10]) # Normalize quaternion
         
@@ -180,63 +182,58 @@ class ExtendedKalmanFilter:
             logger.warning(f"Cannot convert GPS to NED: {e}")
             return
         
-        H = np.zeros((3, 15))
-        H[0:3, 0:3] = np.eye(3)
-        
+        # H selects position, so H @ P @ H.T and P @ H.T are just slices of P
         y = ned_pos - self.state[0:3]
         
-        S = H @ self.P @ H.T + self.R_gps
+        S = self.P[0:3, 0:3] + self.R_gps
         try:
-            K = self.P @ H.T @ np.linalg.inv(S)
+            K = self.P[:, 0:3] @ np.linalg.inv(S)
         except np.linalg.LinAlgError:
             logger.warning("Singular matrix S in GPS update, skipping update step.")
             return
             
         self.state += K @ y
-        self.P = (np.eye(15) - K @ H) @ self.P
+        self.P = self.P - K @ self.P[0:3, :]
         
     def update_baro(self, altitude: float):
         """
         Update with barometer measurement (medium rate - 10Hz)
         """
-        H = np.zeros((1, 15))
-        H[0, 2] = -1  # Z position (NED, so negative for altitude)
-        H[0, 14] = 1  # Baro bias
-        
+        # H is -1 on Z position (NED, so negative for altitude) and +1 on baro bias
         z_expected = -self.state[2] + self.state[14]
         y = altitude - z_expected
         
-        S_scalar = H @ self.P @ H.T + self.R_baro 
+        PHt = self.P[:, 14] - self.P[:, 2]
+        S_scalar = PHt[14] - PHt[2] + self.R_baro
         if S_scalar <= 1e-9:
             logger.warning(f"Baro update S_scalar too small ({S_scalar}), skipping update.")
             return
 
-        K = (self.P @ H.T) / S_scalar 
+        K = PHt / S_scalar
         
-        self.state += K.flatten() * y
-        self.P = (np.eye(15) - np.outer(K, H)) @ self.P
+        self.state += K * y
+        self.P = self.P - np.outer(K, self.P[14, :] - self.P[2, :])
         
     def update_mag(self, mag: np.ndarray):
         """
         Update with magnetometer measurement (for heading correction)
         """
-        H = np.zeros((3, 15))
-        H[0:3, 6:9] = np.eye(3)
+        # H selects qw, qx, qy, so H @ P @ H.T and P @ H.T are just slices of P
         
         # Expected magnetic field in body frame
         mag_body_expected = self._rotate_vector(self.mag_ref_ned, self.state[6:10])
         
         y = mag - mag_body_expected
         
-        S = H @ self.P @ H.T + self.R_mag
+        S = self.P[6:9, 6:9] + self.R_mag
         try:
-            K = self.P @ H.T @ np.linalg.inv(S)
+            K = self.P[:, 6:9] @ np.linalg.inv(S)
         except np.linalg.LinAlgError:
             logger.warning("Singular matrix S in Mag update, skipping update step.")
             return
             
         self.state += K @ y
-        self.P = (np.eye(15) - K @ H) @ self.P
+        self.P = self.P - K @ self.P[6:9, :]
         
         self.state[6:10] /= np.linalg.norm(self.state[6:10])
         
@@ -389,13 +386,14 @@ class ExtendedKalmanFilter:
     def check_filter_health(self) -> dict:
         cov_diag = np.diag(self.P)
         
-        is_symmetric_np = np.allclose(self.P, self.P.T)
+        # Same tolerances as np.allclose, without its per-call overhead
+        is_symmetric_np = bool((np.abs(self.P - self.P.T) <= 1e-8 + 1e-5 * np.abs(self.P.T)).all())
         is_positive_definite_np = False
         quaternion_normalized_np = False
         
         # Check for NaNs or Infs in state and covariance
-        state_finite = np.all(np.isfinite(self.state))
-        P_finite = np.all(np.isfinite(self.P))
+        state_finite = np.isfinite(self.state).all()
+        P_finite = np.isfinite(self.P).all()
 
         if not state_finite:
             logger.error("EKF State contains NaN or Inf.")
@@ -405,10 +403,10 @@ class ExtendedKalmanFilter:
         if P_finite:
             try:
                 if is_symmetric_np:
-                    eigenvalues = np.linalg.eigvals(self.P)
-                    is_positive_definite_np = np.all(eigenvalues > 1e-12)
+                    # All eigenvalues > 1e-12 exactly when P - 1e-12*I has a Cholesky factor
+                    np.linalg.cholesky(self.P - 1e-12 * self._I)
+                    is_positive_definite_np = True
             except np.linalg.LinAlgError:
-                logger.warning("LinAlgError during eigenvalue decomposition for P.")
                 is_positive_definite_np = False
         else:
             is_symmetric_np = False
@@ -431,8 +429,8 @@ class ExtendedKalmanFilter:
             'covariance_symmetric': bool(is_symmetric_np),
             'covariance_positive_definite': bool(is_positive_definite_np),
             'quaternion_normalized': bool(quaternion_normalized_np),
-            'position_uncertainty': [float(x) for x in pos_unc],
-            'velocity_uncertainty': [float(x) for x in vel_unc],
+            'position_uncertainty': pos_unc.tolist(),
+            'velocity_uncertainty': vel_unc.tolist(),
             'max_uncertainty': float(max_unc_val)
         }
 
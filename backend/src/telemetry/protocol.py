@@ -23,12 +23,12 @@ class BrunitoParser:
         self.packet_count = 0
         self.error_count = 0
     
-    def parse_telemetry(self, data_line: str) -> Optional[Dict]:
+    def parse_telemetry(self, data_line: bytes) -> Optional[Dict]:
         """
         Parse a Brunito telemetry line.
         
         Args:
-            data_line: Raw telemetry string like "<05/27/2025,11:43:46,0.95,-37..."
+            data_line: Raw telemetry line like b"<05/27/2025,11:43:46,0.95,-37..."
             
         Returns:
             Parsed telemetry dict or None if invalid
@@ -38,13 +38,14 @@ class BrunitoParser:
             data_line = data_line.strip()
             
             # Validate packet format
-            if not data_line.startswith('<') or not data_line.endswith('>'):
+            if not data_line.startswith(b'<') or not data_line.endswith(b'>'):
                 self.error_count += 1
                 return None
             
             # Remove brackets and split
             clean_data = data_line[1:-1]  # Remove < and >
-            fields = clean_data.split(',')
+            # Numeric fields stay as bytes, int()/float() accept them directly
+            fields = clean_data.split(b',')
             
             # Determine packet type by field count
             if len(fields) == self.ARMED_FIELD_COUNT:
@@ -61,6 +62,13 @@ class BrunitoParser:
             logger.error(f"Parse error: {e}")
             return None
     
+    def snapshot(self) -> Dict:
+        """Get a consistent copy of the parser counters."""
+        return {
+            'packets_received': self.packet_count,
+            'packets_errors': self.error_count
+        }
+    
     def _parse_armed_telemetry(self, fields: list) -> Dict:
         """Parse ARMED state telemetry (16 fields)."""
         try:
@@ -101,7 +109,7 @@ class BrunitoParser:
             }
             
             # Calculate derived values
-            parsed.update(self._calculate_derived_values(parsed))
+            self._add_derived_values(parsed)
             
             self.packet_count += 1
             return parsed
@@ -135,8 +143,26 @@ class BrunitoParser:
             logger.error(f"Error parsing RECOVERY telemetry: {e}")
             return None
     
-    def _parse_timestamp(self, date_str: str, time_str: str) -> datetime:
+    def _parse_timestamp(self, date_field: bytes, time_field: bytes) -> datetime:
         """Parse MM/DD/YYYY,HH:MM:SS.ffffff format with fallback to HH:MM:SS."""
+        # Fast path: slice the fixed-width layout the flight computer sends
+        # instead of running strptime's format machinery on every packet
+        hms, _, fraction = time_field.partition(b'.')
+        if len(date_field) == 10 and len(hms) == 8 and len(fraction) <= 6 and \
+           date_field[2:3] == date_field[5:6] == b'/' and hms[2:3] == hms[5:6] == b':' and \
+           (date_field.replace(b'/', b'') + hms.replace(b':', b'') + fraction).isdigit() and \
+           (fraction or b'.' not in time_field):
+            try:
+                return datetime(
+                    int(date_field[6:10]), int(date_field[0:2]), int(date_field[3:5]),
+                    int(hms[0:2]), int(hms[3:5]), int(hms[6:8]),
+                    int(fraction.ljust(6, b'0')) if fraction else 0
+                )
+            except ValueError:
+                pass  # Out-of-range fields; let strptime raise the usual error
+        
+        date_str = date_field.decode('ascii')
+        time_str = time_field.decode('ascii')
         try:
             # Try with microseconds first
             return datetime.strptime(f"{date_str},{time_str}", "%m/%d/%Y,%H:%M:%S.%f")
@@ -144,33 +170,22 @@ class BrunitoParser:
             # Fallback to seconds only for backward compatibility
             return datetime.strptime(f"{date_str},{time_str}", "%m/%d/%Y,%H:%M:%S")
     
-    def _calculate_derived_values(self, data: Dict) -> Dict:
-        """Calculate derived values from raw telemetry."""
-        derived = {}
-        
+    def _add_derived_values(self, data: Dict):
+        """Add values derived from raw telemetry to the packet dict in place."""
+        # Written straight into the packet rather than merged from a temporary dict
         # Total acceleration magnitude
         if 'accel_x_mps2' in data:
-            derived['accel_magnitude_mps2'] = math.sqrt(
-                data['accel_x_mps2']**2 + 
-                data['accel_y_mps2']**2 + 
-                data['accel_z_mps2']**2
-            )
-            derived['accel_magnitude_g'] = derived['accel_magnitude_mps2'] / 9.81
+            ax, ay, az = data['accel_x_mps2'], data['accel_y_mps2'], data['accel_z_mps2']
+            accel_magnitude_mps2 = math.sqrt(ax**2 + ay**2 + az**2)
+            data['accel_magnitude_mps2'] = accel_magnitude_mps2
+            data['accel_magnitude_g'] = accel_magnitude_mps2 / 9.81
         
         # Total angular rate
         if 'gyro_x_dps' in data:
-            derived['gyro_magnitude_dps'] = math.sqrt(
-                data['gyro_x_dps']**2 + 
-                data['gyro_y_dps']**2 + 
-                data['gyro_z_dps']**2
-            )
+            gx, gy, gz = data['gyro_x_dps'], data['gyro_y_dps'], data['gyro_z_dps']
+            data['gyro_magnitude_dps'] = math.sqrt(gx**2 + gy**2 + gz**2)
         
         # Magnetic field strength
         if 'mag_x_ut' in data:
-            derived['mag_magnitude_ut'] = math.sqrt(
-                data['mag_x_ut']**2 + 
-                data['mag_y_ut']**2 + 
-                data['mag_z_ut']**2
-            )
-        
-        return derived
\ No newline at end of file
+            mx, my, mz = data['mag_x_ut'], data['mag_y_ut'], data['mag_z_ut']
+            data['mag_magnitude_ut'] = math.sqrt(mx**2 + my**2 + mz**2)
@@ -6,6 +6,11 @@ from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Field names checked per axis, built once instead of formatted for every packet
+_ACCEL_KEYS = ('accel_x_mps2', 'accel_y_mps2', 'accel_z_mps2')
+_GYRO_KEYS = ('gyro_x_dps', 'gyro_y_dps', 'gyro_z_dps')
+_MAG_KEYS = ('mag_x_ut', 'mag_y_ut', 'mag_z_ut')
+
 class DataValidator:
     """Validates telemetry data quality."""
     
@@ -24,30 +29,32 @@ class DataValidator:
         Returns:
             Dictionary with validation results for each subsystem
         """
-        self.validation_stats['total_packets'] += 1
-        
-        quality = {
-            'gps_valid': self._validate_gps(data),
-            'imu_valid': self._validate_imu(data),
-            'mag_valid': self._validate_magnetometer(data),
-            'baro_valid': self._validate_barometer(data),
-            'temp_valid': self._validate_temperature(data),
-            'overall_valid': True
-        }
+        stats = self.validation_stats
+        stats['total_packets'] += 1
+        
+        gps_valid = self._validate_gps(data)
+        imu_valid = self._validate_imu(data)
+        mag_valid = self._validate_magnetometer(data)
+        baro_valid = self._validate_barometer(data)
+        temp_valid = self._validate_temperature(data)
         
         # Overall validity
-        quality['overall_valid'] = all([
-            quality['gps_valid'],
-            quality['imu_valid'],
-            quality['mag_valid'],
-            quality['baro_valid'],
-            quality['temp_valid']
-        ])
-        
-        if quality['overall_valid']:
-            self.validation_stats['valid_packets'] += 1
-        
-        return quality
+        overall_valid = gps_valid and imu_valid and mag_valid and baro_valid and temp_valid
+        if overall_valid:
+            stats['valid_packets'] += 1
+        
+        return {
+            'gps_valid': gps_valid,
+            'imu_valid': imu_valid,
+            'mag_valid': mag_valid,
+            'baro_valid': baro_valid,
+            'temp_valid': temp_valid,
+            'overall_valid': overall_valid
+        }
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Get a consistent copy of the validation statistics."""
+        return dict(self.validation_stats)
     
     def _validate_gps(self, data: Dict) -> bool:
         """Validate GPS data quality."""
@@ -82,16 +89,17 @@ class DataValidator:
         
         # Check acceleration ranges
         max_accel = settings.ACCEL_MAX_G * 9.81
-        for axis in ['x', 'y', 'z']:
-            accel = abs(data.get(f'accel_{axis}_mps2', 0))
+        for key in _ACCEL_KEYS:
+            accel = abs(data.get(key, 0))
             if accel > max_accel:
                 self.validation_stats['sensor_failures'] += 1
                 return False
         
         # Check gyroscope ranges
-        for axis in ['x', 'y', 'z']:
-            gyro = abs(data.get(f'gyro_{axis}_dps', 0))
-            if gyro > settings.GYRO_MAX_DPS:
+        max_gyro = settings.GYRO_MAX_DPS
+        for key in _GYRO_KEYS:
+            gyro = abs(data.get(key, 0))
+            if gyro > max_gyro:
                 self.validation_stats['sensor_failures'] += 1
                 return False
         
@@ -103,7 +111,7 @@ class DataValidator:
             return True  # Magnetometer not available
         
         # Check for all-zero readings (sensor failure)
-        if all(data.get(f'mag_{axis}_ut', 0) == 0 for axis in ['x', 'y', 'z']):
+        if all(data.get(key, 0) == 0 for key in _MAG_KEYS):
             return False
         
         # Check magnetic field magnitude is reasonable
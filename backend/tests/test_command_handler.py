@@ -0,0 +1,136 @@
+"""Tests for command response matching in CommandHandler."""
+import asyncio
+import time
+
+import pytest
+
+from src.communication.command_handler import CommandHandler
+
+
+class FakeSerialManager:
+    """Records sent commands instead of writing to a port."""
+
+    def __init__(self, send_ok: bool = True):
+        self.sent = []
+        self.send_ok = send_ok
+
+    async def send_command(self, command: str) -> bool:
+        self.sent.append(command)
+        return self.send_ok
+
+
+async def _wait_until_sent(serial_manager: FakeSerialManager, count: int):
+    while len(serial_manager.sent) < count:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_ack_resolves_pending_command():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+
+    task = asyncio.create_task(handler.execute_command("ping"))
+    await _wait_until_sent(serial_manager, 1)
+
+    assert handler.resolve(b"ACK:PING")
+    response = await task
+
+    assert response["status"] == "success"
+    assert response["message"] == "ACK:PING"
+    assert handler.pending_commands == {}
+    assert handler.get_command_history()[-1]["command"] == "ping"
+
+
+@pytest.mark.asyncio
+async def test_nak_reports_reason():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+
+    task = asyncio.create_task(handler.execute_command("ARM"))
+    await _wait_until_sent(serial_manager, 1)
+
+    assert handler.resolve(b"NAK:ARM:NOT_READY")
+    response = await task
+
+    assert response["status"] == "error"
+    assert response["message"] == "NOT_READY"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_commands_each_get_their_ack():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+
+    first = asyncio.create_task(handler.execute_command("PING"))
+    second = asyncio.create_task(handler.execute_command("PING"))
+    await _wait_until_sent(serial_manager, 2)
+    assert len(handler.pending_commands["PING"]) == 2
+
+    assert handler.resolve(b"ACK:PING:1")
+    assert handler.resolve(b"ACK:PING:2")
+
+    assert (await first)["message"] == "ACK:PING:1"
+    assert (await second)["message"] == "ACK:PING:2"
+    assert handler.pending_commands == {}
+
+
+@pytest.mark.asyncio
+async def test_timeout_removes_waiter_so_next_ack_goes_to_newer_command():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+    handler.response_timeout_s = 0.05
+
+    stale = await handler.execute_command("STATUS")
+    assert stale["status"] == "timeout"
+    assert handler.pending_commands == {}
+
+    handler.response_timeout_s = 5.0
+    task = asyncio.create_task(handler.execute_command("STATUS"))
+    await _wait_until_sent(serial_manager, 2)
+    assert handler.resolve(b"ACK:STATUS")
+    assert (await task)["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_failed_send_does_not_leave_a_waiter():
+    handler = CommandHandler(FakeSerialManager(send_ok=False))
+
+    response = await handler.execute_command("PING")
+
+    assert response["status"] == "error"
+    assert handler.pending_commands == {}
+
+
+def test_unsolicited_ack_is_consumed():
+    handler = CommandHandler(FakeSerialManager())
+
+    assert handler.resolve(b"ACK:PING")
+    assert not handler.resolve(b"<ARMED,2024-01-01>")
+
+
+@pytest.mark.asyncio
+async def test_unknown_command_is_rejected_without_sending():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+
+    response = await handler.execute_command("SELF_DESTRUCT")
+
+    assert response["status"] == "error"
+    assert serial_manager.sent == []
+
+
+@pytest.mark.asyncio
+async def test_response_timestamps_are_safe_javascript_integers():
+    serial_manager = FakeSerialManager()
+    handler = CommandHandler(serial_manager)
+
+    task = asyncio.create_task(handler.execute_command("PING"))
+    await _wait_until_sent(serial_manager, 1)
+    handler.resolve(b"ACK:PING")
+    response = await task
+
+    assert response["timestamp"] < 2 ** 53 # Number.MAX_SAFE_INTEGER + 1
+    assert abs(response["timestamp"] / 1000 - time.time()) < 60
+    # History keeps full resolution
+    entry = handler.get_command_history()[-1]
+    assert entry["response"]["timestamp"] // 1_000_000 == response["timestamp"]
@@ -0,0 +1,140 @@
+"""Tests for the DataLogger writer thread."""
+import csv
+import threading
+import time
+
+import pytest
+
+from src.config import settings
+from src.processing import data_logger as data_logger_module
+from src.processing.data_logger import DataLogger
+
+
+def _packet(i: int) -> dict:
+    return {
+        'timestamp': f"2024-01-01T00:00:{i % 60:02d}",
+        'mode': 'ARMED',
+        'altitude_m': float(i),
+        'quality': {'gps_valid': True, 'imu_valid': True, 'overall_valid': True}
+    }
+
+
+def _read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def data_logger(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'LOG_DIRECTORY', str(tmp_path))
+    logger = DataLogger()
+    yield logger
+    logger.stop_session()
+
+
+def test_logged_packets_are_on_disk_after_stop(data_logger, tmp_path):
+    session_id = data_logger.start_session()
+    for i in range(500):
+        data_logger.log_packet(_packet(i))
+    data_logger.stop_session()
+
+    rows = _read_rows(tmp_path / f"flight_{session_id}.csv")
+    assert rows[0][:3] == ['timestamp', 'mode', 'altitude_m']
+    assert len(rows) == 501
+    assert rows[-1][2] == '499.0'
+    assert rows[-1][-3:] == ['True', 'True', 'True']
+
+
+def test_missing_fields_are_left_blank(data_logger, tmp_path):
+    session_id = data_logger.start_session()
+    data_logger.log_packet({'timestamp': 't', 'gps_valid': False})
+    data_logger.stop_session()
+
+    row = _read_rows(tmp_path / f"flight_{session_id}.csv")[1]
+    assert row[0] == 't'
+    assert row[1] == ''
+    assert row[-3] == 'False'
+
+
+def test_rows_are_synced_in_batches_not_per_packet(data_logger, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(data_logger_module.os, 'fsync', syncs.append)
+
+    data_logger.start_session()
+    for i in range(2000):
+        data_logger.log_packet(_packet(i))
+    data_logger.stop_session()
+
+    assert 1 <= len(syncs) <= 3
+    assert data_logger.packets_logged == 0 # Reset by stop_session
+
+
+def test_new_session_does_not_wait_for_previous_writer(data_logger, tmp_path, monkeypatch):
+    release = threading.Event()
+    syncing = threading.Event()
+    real_fsync = data_logger_module.os.fsync
+
+    def slow_fsync(fd):
+        syncing.set()
+        release.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr(data_logger_module.os, 'fsync', slow_fsync)
+
+    first_id = data_logger.start_session()
+    for i in range(10):
+        data_logger.log_packet(_packet(i))
+
+    second_id = data_logger.start_session() # Old writer blocks in its final fsync
+    assert syncing.wait(5)
+    assert second_id != first_id
+    data_logger.log_packet(_packet(10))
+
+    release.set()
+    data_logger.stop_session()
+
+    assert len(_read_rows(tmp_path / f"flight_{first_id}.csv")) == 11
+    assert len(_read_rows(tmp_path / f"flight_{second_id}.csv")) == 2
+
+
+def test_draining_writer_does_not_count_toward_new_session(data_logger, monkeypatch):
+    release = threading.Event()
+    real_csv_row = data_logger_module._csv_row
+
+    def slow_csv_row(telemetry):
+        if telemetry.get('mode') == 'OLD':
+            release.wait(5)
+        return real_csv_row(telemetry)
+
+    monkeypatch.setattr(data_logger_module, '_csv_row', slow_csv_row)
+
+    data_logger.start_session()
+    for i in range(20):
+        data_logger.log_packet({**_packet(i), 'mode': 'OLD'})
+
+    data_logger.start_session() # Old writer is still stuck on its backlog
+    for i in range(3):
+        data_logger.log_packet(_packet(i))
+
+    release.set()
+    for thread in list(data_logger._retired_writers):
+        thread.join(5)
+    for _ in range(50):
+        if data_logger.packets_logged == 3:
+            break
+        time.sleep(0.05)
+
+    assert data_logger.packets_logged == 3
+
+
+def test_full_queue_drops_instead_of_blocking(data_logger, monkeypatch):
+    monkeypatch.setattr(data_logger_module, '_QUEUE_MAX_PACKETS', 5)
+    release = threading.Event()
+    monkeypatch.setattr(data_logger_module, '_csv_row', lambda telemetry: release.wait(5) and ())
+
+    data_logger.start_session()
+    for i in range(50):
+        data_logger.log_packet(_packet(i))
+
+    assert data_logger.packets_dropped > 0
+    release.set()
@@ -0,0 +1,140 @@
+"""Tests for the flight event detectors and their incremental statistics."""
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.processing.event_detector import EventDetector, RollingStats
+from src.telemetry.event_detector import ApogeePredictor, EnhancedEventDetector, FlightPhase
+
+
+def test_rolling_stats_match_a_full_recompute():
+    rng = random.Random(7)
+    stats = RollingStats(5)
+    window = []
+
+    for _ in range(200):
+        x = rng.uniform(-3.0, 3.0)
+        stats.append(x)
+        window = (window + [x])[-5:]
+
+        assert len(stats) == len(window)
+        assert stats.mean() == pytest.approx(statistics.fmean(window), abs=1e-9)
+        assert stats.variance() == pytest.approx(statistics.pvariance(window), abs=1e-9)
+
+
+def test_rolling_stats_variance_is_never_negative_and_clear_resets():
+    stats = RollingStats(3)
+    for _ in range(10):
+        stats.append(1e8 + 0.1)
+    assert stats.variance() >= 0.0
+
+    stats.clear()
+    assert len(stats) == 0
+    stats.append(2.0)
+    assert stats.mean() == 2.0
+
+
+def _armed(accel_g: float, altitude_m: float) -> dict:
+    return {'mode': 'ARMED', 'accel_magnitude_g': accel_g, 'altitude_m': altitude_m}
+
+
+def test_legacy_detector_reports_launch_apogee_and_landing():
+    detector = EventDetector()
+    detector.set_phase('ARMED')
+
+    samples = [_armed(3.0, 0.0)] * 5
+    samples += [_armed(1.0, 100.0 * i) for i in range(1, 11)] # Climb to 1000 m
+    samples += [_armed(1.0, 1000.0 - 100.0 * i) for i in range(1, 11)] # Descend to the ground
+    samples += [_armed(1.0, 0.0)] * 10
+
+    events = [event['type'] for sample in samples for event in detector.process_telemetry(sample)]
+
+    # The detector stays in FLIGHT after apogee, so the flat stretch on the ground
+    # can match the rise-then-fall window again before landing is confirmed
+    assert events[0] == 'LAUNCH_DETECTED'
+    assert events[1] == 'APOGEE_DETECTED'
+    assert events[-1] == 'LANDING_DETECTED'
+    assert set(events[1:-1]) == {'APOGEE_DETECTED'}
+    assert detector.get_stats()['max_altitude_m'] == 1000.0
+
+
+def test_legacy_detector_needs_five_consecutive_high_samples():
+    detector = EventDetector()
+    detector.set_phase('ARMED')
+
+    for accel_g in (3.0, 3.0, 3.0, 3.0, 1.0, 3.0, 3.0, 3.0, 3.0):
+        assert detector.process_telemetry(_armed(accel_g, 0.0)) == []
+
+    assert detector.process_telemetry(_armed(3.0, 0.0))[0]['type'] == 'LAUNCH_DETECTED'
+
+
+def test_legacy_detector_ignores_unknown_phase():
+    detector = EventDetector()
+    detector.set_phase('ORBIT')
+
+    assert detector.current_phase.value == 'IDLE'
+
+
+def test_apogee_predictor_fits_constant_deceleration():
+    predictor = ApogeePredictor()
+    for i in range(10):
+        t = i * 0.1
+        predictor.add_sample(t, 0.0, 20.0 - 9.81 * t)
+
+    assert predictor.predict_apogee_time() == pytest.approx(20.0 / 9.81)
+
+
+def test_apogee_predictor_gives_up_once_window_is_descending():
+    predictor = ApogeePredictor()
+    for i in range(10):
+        predictor.add_sample(i * 0.1, 0.0, 5.0 - i)
+
+    assert predictor.predict_apogee_time() is None
+
+
+def _packet(t0: datetime, i: int, accel_g: float, altitude_m: float, velocity_mps: float) -> dict:
+    return {
+        'timestamp': (t0 + timedelta(seconds=i * 0.1)).isoformat(),
+        'accel_magnitude_g': accel_g,
+        'altitude_m': altitude_m,
+        'filtered_state': {'vertical_velocity': velocity_mps}
+    }
+
+
+def test_flight_summary_snapshots_survive_later_transitions():
+    detector = EnhancedEventDetector()
+    t0 = datetime(2024, 1, 1, 12, 0, 0)
+    detector.set_phase_externally('ARMED', t0)
+
+    before = detector.get_flight_summary()
+    assert detector.get_flight_summary()['events'] is before['events'] # Reused until a transition
+
+    i = 0
+    while detector.current_phase == FlightPhase.ARMED and i < 20:
+        i += 1
+        detector.process_telemetry(_packet(t0, i, 5.0, 10.0 * i, 30.0))
+
+    after = detector.get_flight_summary()
+    assert detector.current_phase == FlightPhase.LAUNCH
+    assert [e['type'] for e in after['events']] == ['IDLE_TO_ARMED', 'ARMED_TO_LAUNCH']
+    assert [p for _, p in after['phase_history']][-1] == 'LAUNCH'
+    assert after['current_phase'] == 'LAUNCH'
+    assert [e['type'] for e in before['events']] == ['IDLE_TO_ARMED']
+    assert before['current_phase'] == 'ARMED'
+
+
+def test_flight_summary_statistics_track_running_maxima():
+    detector = EnhancedEventDetector()
+    t0 = datetime(2024, 1, 1, 12, 0, 0)
+    detector.set_phase_externally('ARMED', t0)
+
+    for i, (accel_g, altitude_m, velocity_mps) in enumerate([(1.0, 5.0, 2.0), (1.5, 3.0, -8.0), (1.2, 4.0, 1.0)]):
+        detector.process_telemetry(_packet(t0, i + 1, accel_g, altitude_m, velocity_mps))
+
+    stats = detector.get_flight_summary()['statistics']
+    assert stats['max_acceleration_g'] == 1.5
+    assert stats['max_velocity_mps'] == 8.0
+    assert stats['max_altitude_m'] == 5.0
+    assert list(stats) == ['phase_durations', 'max_acceleration_g', 'max_velocity_mps', 'max_altitude_m', 'total_flight_time_s']
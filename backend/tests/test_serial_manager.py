@@ -0,0 +1,111 @@
+"""Tests for splitting the serial byte stream into packets."""
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.communication import serial_manager as serial_manager_module
+from src.communication.serial_manager import SerialManager
+
+
+@pytest_asyncio.fixture
+async def connected():
+    manager = SerialManager()
+    manager.reader = asyncio.StreamReader()
+    manager.is_connected = True
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_returns_every_complete_line_and_keeps_partial_tail(connected):
+    connected.reader.feed_data(b"<A,1>\r\n<B,2>\n\n<C,")
+
+    assert await connected.read_packets() == [b"<A,1>", b"<B,2>"]
+
+    connected.reader.feed_data(b"3>\n")
+    assert await connected.read_packets() == [b"<C,3>"]
+
+
+@pytest.mark.asyncio
+async def test_waits_for_a_newline_across_chunks(connected):
+    connected.reader.feed_data(b"<A,")
+    task = asyncio.create_task(connected.read_packets())
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    connected.reader.feed_data(b"1>\n")
+    assert await task == [b"<A,1>"]
+
+
+@pytest.mark.asyncio
+async def test_packets_own_their_bytes(connected):
+    connected.reader.feed_data(b"<A,1>\n<B,")
+    packets = await connected.read_packets()
+
+    connected.reader.feed_data(b"2>\n")
+    await connected.read_packets()
+
+    assert packets == [b"<A,1>"]
+    assert isinstance(packets[0], bytes)
+
+
+@pytest.mark.asyncio
+async def test_eof_marks_port_disconnected(connected):
+    connected.reader.feed_eof()
+
+    assert await connected.read_packets() == []
+    assert not connected.is_connected
+
+
+@pytest.mark.asyncio
+async def test_stream_without_newlines_is_capped(connected, monkeypatch):
+    monkeypatch.setattr(serial_manager_module, '_MAX_LINE_BYTES', 100)
+    monkeypatch.setattr(serial_manager_module, '_READ_CHUNK_SIZE', 64)
+
+    connected.reader.feed_data(b"\xff" * 1000)
+    connected.reader.feed_data(b"<A,1>\n")
+    packets = await connected.read_packets()
+
+    # Noise after the last discard may prefix the packet; the buffer never grew unbounded
+    assert packets[-1].endswith(b"<A,1>")
+    assert len(packets[-1]) <= 100 + 64
+    assert len(connected._rx_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_not_connected_returns_nothing():
+    assert await SerialManager().read_packets() == []
+
+
+@pytest.mark.asyncio
+async def test_read_error_marks_port_disconnected(connected):
+    connected.reader.set_exception(OSError("device reports readiness to read but returned no data"))
+
+    assert await connected.read_packets() == []
+    assert not connected.is_connected
+
+
+@pytest.mark.asyncio
+async def test_read_loop_keeps_yielding_after_read_error(connected, monkeypatch):
+    from src import main
+
+    monkeypatch.setattr(main.settings, 'USE_SIMULATOR', False)
+    monkeypatch.setattr(main, 'serial_manager', connected)
+    connected.reader.set_exception(OSError("device disconnected"))
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    tasks = [asyncio.create_task(main.telemetry_read_loop()), asyncio.create_task(ticker())]
+    await asyncio.sleep(0.05)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert ticks > 10
+    assert not connected.is_connected
@@ -0,0 +1,153 @@
+"""Tests for batched, per-client WebSocket broadcasting."""
+import asyncio
+
+import orjson
+import pytest
+
+from src.communication.websocket_manager import WebSocketManager
+from src.config import settings
+
+
+class FakeWebSocket:
+    """Collects sent frames; can be made to stall or fail on send."""
+
+    def __init__(self, name: str = "client"):
+        self.client = name
+        self.sent = []
+        self.closed = False
+        self.stall = None # asyncio.Event that send_text waits on when set
+        self.fail = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.fail:
+            raise ConnectionError("socket closed")
+        if self.stall is not None:
+            await self.stall.wait()
+        self.sent.append(orjson.loads(payload))
+
+    async def close(self):
+        self.closed = True
+
+
+async def _drain():
+    # Let sender tasks pick up queued frames
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def manager():
+    return WebSocketManager()
+
+
+@pytest.mark.asyncio
+async def test_packets_within_window_go_out_as_one_frame(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_WINDOW_S', 0.01)
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 16)
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    for i in range(3):
+        manager.enqueue_telemetry({"seq": i})
+    await _drain()
+    assert ws.sent == []
+
+    await asyncio.sleep(0.03)
+    await _drain()
+    assert ws.sent == [{"type": "telemetry_batch", "data": [{"seq": 0}, {"seq": 1}, {"seq": 2}]}]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_for_window(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_WINDOW_S', 10.0)
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 2)
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    for i in range(5):
+        manager.enqueue_telemetry({"seq": i})
+    await _drain()
+
+    assert [len(frame["data"]) for frame in ws.sent] == [2, 2]
+    await manager.close_all() # Cancels the pending window for the fifth packet
+
+
+@pytest.mark.asyncio
+async def test_batch_size_one_flushes_every_packet(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_WINDOW_S', 10.0)
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 1)
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    manager.enqueue_telemetry({"seq": 0})
+    manager.enqueue_telemetry({"seq": 1})
+    await _drain()
+
+    assert [frame["data"] for frame in ws.sent] == [[{"seq": 0}], [{"seq": 1}]]
+    assert manager._flush_handle is None
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_queued_without_clients(manager):
+    manager.enqueue_telemetry({"seq": 0})
+
+    assert manager._batch == []
+    assert manager._flush_handle is None
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_evicted_without_holding_back_others(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 1)
+    monkeypatch.setattr(settings, 'WEBSOCKET_CLIENT_QUEUE_SIZE', 2)
+    monkeypatch.setattr(settings, 'WEBSOCKET_SLOW_CLIENT_MAX_DROPS', 3)
+    fast = FakeWebSocket("fast")
+    slow = FakeWebSocket("slow")
+    slow.stall = asyncio.Event()
+    await manager.connect(fast)
+    await manager.connect(slow)
+
+    for i in range(10):
+        manager.enqueue_telemetry({"seq": i})
+        await _drain()
+
+    assert len(fast.sent) == 10
+    assert slow not in manager.clients
+    assert fast in manager.clients
+    assert slow.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_send_disconnects_client(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 1)
+    ws = FakeWebSocket()
+    ws.fail = True
+    await manager.connect(ws)
+
+    manager.enqueue_telemetry({"seq": 0})
+    await _drain()
+
+    assert ws not in manager.clients
+    assert manager._channels == {}
+
+
+@pytest.mark.asyncio
+async def test_close_all_waits_for_evicted_clients_to_close(manager, monkeypatch):
+    monkeypatch.setattr(settings, 'WEBSOCKET_BATCH_MAX_PACKETS', 1)
+    monkeypatch.setattr(settings, 'WEBSOCKET_CLIENT_QUEUE_SIZE', 1)
+    monkeypatch.setattr(settings, 'WEBSOCKET_SLOW_CLIENT_MAX_DROPS', 1)
+    slow = FakeWebSocket("slow")
+    slow.stall = asyncio.Event()
+    await manager.connect(slow)
+
+    for i in range(3):
+        manager.enqueue_telemetry({"seq": i})
+    assert slow not in manager.clients
+    assert manager._closing # Eviction close() scheduled but not run yet
+
+    await manager.close_all()
+
+    assert slow.closed
+    assert not manager._closing
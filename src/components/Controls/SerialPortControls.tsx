@@ -34,14 +34,17 @@ export function SerialPortControls() {
     setIsTesting(true);
     const results = new Map();
     
-    for (const port of serialPorts) {
-      try {
-        const testResult = await serialPortAPI.testPort(port.device);
-        results.set(port.device, {
+    try {
+      // One request; the backend probes all ports concurrently
+      const testResults = await serialPortAPI.testAllPorts();
+      for (const testResult of testResults) {
+        results.set(testResult.port, {
           hasValidData: testResult.hasValidData,
           keywords: testResult.keywords
         });
-      } catch (error) {
+      }
+    } catch (error) {
+      for (const port of serialPorts) {
         results.set(port.device, {
           hasValidData: false,
           keywords: []
@@ -28,6 +28,12 @@ export interface PortTestResponse {
   sampleData?: string;
 }
 
+export interface PortTestAllResponse {
+  status: string;
+  message?: string;
+  results: (PortTestResponse & { port: string })[];
+}
+
 export async function listPorts(): Promise<SerialPort[]> {
   const response = await fetch(`${API_BASE_URL}/serial/ports`);
   if (!response.ok) {
@@ -71,6 +77,21 @@ export async function testPort(port: string): Promise<PortTestResponse> {
   return data;
 }
 
+export async function testAllPorts(): Promise<(PortTestResponse & { port: string })[]> {
+  const response = await fetch(`${API_BASE_URL}/serial/test_all`);
+  if (!response.ok) {
+    const errorText = await response.text().catch(() => 'Failed to get error details');
+    console.error(`Failed to test ports: ${response.status} ${response.statusText}`, errorText);
+    throw new Error(`Failed to test ports: ${response.statusText}`);
+  }
+  const data: PortTestAllResponse = await response.json();
+  if (data.status === 'error') {
+    console.error('Error from backend testing ports:', data.message);
+    throw new Error(data.message || 'Backend error testing ports');
+  }
+  return data.results;
+}
+
 export async function openPort(port: string, baudrate: number = 921600): Promise<SerialActionResponse> {
   const response = await fetch(`${API_BASE_URL}/serial/open`, {
     method: "POST",
@@ -141,6 +162,7 @@ export async function writeToPort(data: string): Promise<SerialActionResponse> {
 export const serialPortAPI = {
   listPorts,
   testPort,
+  testAllPorts,
   openPort,
   closePort,
   writeToPort
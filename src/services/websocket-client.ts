@@ -48,6 +48,13 @@ class WebSocketClient {
               this.telemetryCallbacks.forEach(cb => cb(message.data as TelemetryPacket));
               break;
               
+            case 'telemetry_batch':
+              // Packets coalesced by the backend's broadcast window, delivered in order
+              (message.data as TelemetryPacket[]).forEach(packet => {
+                this.telemetryCallbacks.forEach(cb => cb(packet));
+              });
+              break;
+              
             case 'event':
               console.log('Received event:', message.data);
               this.eventCallbacks.forEach(cb => cb(message.data));
@@ -137,7 +137,7 @@ export interface FlightEvent {
 export interface CommandResponse {
   status: 'success' | 'error' | 'timeout';
   message: string;
-  timestamp: string;
+  timestamp: number;  // Unix epoch milliseconds, as used by new Date()
 }
 
 export interface SystemStats {
@@ -167,6 +167,6 @@ export interface SimulatorResponse {
 }
 
 export interface WebSocketMessage {
-  type: 'telemetry' | 'event' | 'command_response';
-  data: TelemetryPacket | FlightEvent | CommandResponse;
+  type: 'telemetry' | 'telemetry_batch' | 'event' | 'command_response';
+  data: TelemetryPacket | TelemetryPacket[] | FlightEvent | CommandResponse;
 }
\ No newline at end of file